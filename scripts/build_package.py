@@ -3,6 +3,7 @@
 Скрипт для сборки пакета для PyPI
 """
 
+import importlib.util
 import os
 import shutil
 import subprocess
@@ -11,9 +12,9 @@ from pathlib import Path
 
 
 def run_command(cmd, description):
-    """Выполнить команду с описанием"""
+    """Выполнить команду (список аргументов, без оболочки) с описанием"""
     print(f"🔧 {description}...")
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+    result = subprocess.run(cmd, capture_output=True, text=True)
 
     if result.returncode != 0:
         print(f"❌ Ошибка: {result.stderr}")
@@ -39,13 +40,17 @@ def check_requirements():
     """Проверить наличие необходимых инструментов"""
     required_packages = ['build', 'twine']
 
-    for package in required_packages:
-        if not run_command(f"python -c 'import {package}'", f"Проверка {package}"):
-            print(f"📦 Установка {package}...")
-            if not run_command(f"pip install {package}", f"Установка {package}"):
-                return False
+    # Наличие модулей проверяем в текущем процессе, без запуска интерпретатора
+    missing = [pkg for pkg in required_packages if importlib.util.find_spec(pkg) is None]
+    if not missing:
+        print(f"✅ Найдены: {', '.join(required_packages)}")
+        return True
 
-    return True
+    print(f"📦 Установка {', '.join(missing)}...")
+    return run_command(
+        [sys.executable, "-m", "pip", "install", *missing],
+        f"Установка {', '.join(missing)}",
+    )
 
 
 def validate_package_structure():
@@ -89,7 +94,7 @@ def build_package():
         return False
 
     # Сборка
-    if not run_command("python -m build", "Сборка пакета"):
+    if not run_command([sys.executable, "-m", "build"], "Сборка пакета"):
         return False
 
     # Проверка результата
@@ -109,8 +114,11 @@ def check_package():
     """Проверить собранный пакет"""
     print("🔍 Проверка пакета...")
 
-    # Проверка с помощью twine
-    if not run_command("python -m twine check dist/*", "Проверка пакета twine"):
+    # Проверка с помощью twine (шаблон dist/* раскрываем сами, без оболочки)
+    dist_files = [str(path) for path in sorted(Path('dist').glob('*'))]
+    if not run_command(
+        [sys.executable, "-m", "twine", "check", *dist_files], "Проверка пакета twine"
+    ):
         return False
 
     return True
@@ -4,13 +4,19 @@
 Показывает работу всех созданных компонентов
 """
 
+import io
 import json
+import mmap
 import os
 import sys
 import time
+from collections import defaultdict
+from contextlib import redirect_stdout
+from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
 # Добавляем путь к src для импортов
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -22,10 +28,93 @@ from docxmd_converter.intelligent_processor import (
     NLPAnalyzer,
 )
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    # orjson необязателен: без него используем стандартный json
+    _json_loads = json.loads
+
+
+def _read_bytes(path: Path) -> bytes:
+    """Чтение файла через mmap без промежуточных буферов файлового ввода-вывода"""
+    with open(path, "rb") as f:
+        # mmap не умеет отображать пустые файлы
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:]
+
+
+def _read_text(path: Path) -> str:
+    """Чтение текстового файла в UTF-8 через mmap"""
+    content = _read_bytes(path).decode("utf-8")
+    if "\r" in content:
+        # Та же нормализация переводов строк, что и в текстовом режиме
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def _iter_history(data_dir: Path) -> Iterator[Dict[str, Any]]:
+    """Записи истории обработки в порядке добавления
+
+    Сначала записи из прежнего processing_history.json (один JSON-массив),
+    затем из processing_history.jsonl, который дописывает процессор
+    (одна запись JSON на строку)
+    """
+    legacy_file = data_dir / "processing_history.json"
+    if legacy_file.exists():
+        yield from _json_loads(_read_bytes(legacy_file))
+
+    history_file = data_dir / "processing_history.jsonl"
+    if history_file.exists():
+        with open(history_file, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield _json_loads(line)
+
+
+@dataclass(slots=True)
+class _HistoryStats:
+    """Скользящие агрегаты по записям истории обработки"""
+
+    count: int = 0
+    total_time: float = 0.0
+    min_time: float = float("inf")
+    max_time: float = float("-inf")
+    total_quality: float = 0.0
+    min_quality: float = float("inf")
+    max_quality: float = float("-inf")
+
+    def add(self, processing_time: float, quality: float) -> None:
+        """Учет одной записи истории"""
+        self.count += 1
+        self.total_time += processing_time
+        if processing_time < self.min_time:
+            self.min_time = processing_time
+        if processing_time > self.max_time:
+            self.max_time = processing_time
+        self.total_quality += quality
+        if quality < self.min_quality:
+            self.min_quality = quality
+        if quality > self.max_quality:
+            self.max_quality = quality
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.count
+
+    @property
+    def avg_quality(self) -> float:
+        return self.total_quality / self.count
+
 
 class FeatureDemo:
     """Демонстрация возможностей системы"""
 
+    SAMPLE_FILENAME = "Архивист.md"
+
     def __init__(self):
         self.base_dir = Path("/home/uduntu33/Документы/PROJECT/docxmd_converter")
         self.conversion_dir = self.base_dir / "docs" / "Conversion"
@@ -40,6 +129,14 @@ class FeatureDemo:
         print("🚀 Инициализация демонстрации возможностей")
         print("=" * 60)
 
+    @cached_property
+    def _sample_content(self) -> Optional[str]:
+        """Основной контент демонстрационного файла без метаданных"""
+        sample_file = self.conversion_dir / self.SAMPLE_FILENAME
+        if not sample_file.exists():
+            return None
+        return _read_text(sample_file).split("<!-- METADATA")[0]
+
     def demo_nlp_analysis(self):
         """Демонстрация NLP анализа"""
 
@@ -47,22 +144,13 @@ class FeatureDemo:
         print("-" * 40)
 
         # Берем один из файлов для анализа
-        sample_file = self.conversion_dir / "Архивист.md"
+        main_content = self._sample_content
 
-        if not sample_file.exists():
+        if main_content is None:
             print("❌ Файл для демонстрации не найден")
             return
 
-        with open(sample_file, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        # Отделяем основной контент от метаданных
-        if "<!-- METADATA" in content:
-            main_content = content.split("<!-- METADATA")[0]
-        else:
-            main_content = content
-
-        print(f"📄 Анализируем файл: {sample_file.name}")
+        print(f"📄 Анализируем файл: {self.SAMPLE_FILENAME}")
 
         # 1. Извлечение признаков
         print("\n1️⃣ Извлечение признаков документа:")
@@ -102,21 +190,13 @@ class FeatureDemo:
         print("\n📊 ДЕМОНСТРАЦИЯ ОЦЕНКИ КАЧЕСТВА")
         print("-" * 40)
 
-        sample_file = self.conversion_dir / "Архивист.md"
+        main_content = self._sample_content
 
-        if not sample_file.exists():
+        if main_content is None:
             print("❌ Файл для демонстрации не найден")
             return
 
-        with open(sample_file, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        if "<!-- METADATA" in content:
-            main_content = content.split("<!-- METADATA")[0]
-        else:
-            main_content = content
-
-        print(f"📄 Оцениваем качество: {sample_file.name}")
+        print(f"📄 Оцениваем качество: {self.SAMPLE_FILENAME}")
 
         # Оценка качества
         quality = self.quality_assessor.assess_quality(
@@ -146,21 +226,13 @@ class FeatureDemo:
         print("\n🔍 ДЕМОНСТРАЦИЯ АНАЛИЗА КОНТЕНТА")
         print("-" * 40)
 
-        sample_file = self.conversion_dir / "Архивист.md"
+        main_content = self._sample_content
 
-        if not sample_file.exists():
+        if main_content is None:
             print("❌ Файл для демонстрации не найден")
             return
 
-        with open(sample_file, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        if "<!-- METADATA" in content:
-            main_content = content.split("<!-- METADATA")[0]
-        else:
-            main_content = content
-
-        print(f"📄 Анализируем контент: {sample_file.name}")
+        print(f"📄 Анализируем контент: {self.SAMPLE_FILENAME}")
 
         # Обработка контента
         cleaned_content, analysis_results = self.content_processor.process_content(
@@ -180,7 +252,9 @@ class FeatureDemo:
 
         # Умное извлечение контента
         print(f"\n🧠 Умное извлечение структурированного контента:")
-        structured = self.content_extractor.extract_structured_content(main_content)
+        structured = self.content_extractor.extract_from_analysis(
+            cleaned_content, analysis_results
+        )
 
         for section_name, section_content in list(structured.items())[:3]:
             print(f"   📑 {section_name}: {len(section_content)} символов")
@@ -256,8 +330,7 @@ class FeatureDemo:
             print("❌ Конфигурация шаблонов не найдена")
             return
 
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        config = _json_loads(_read_bytes(config_path))
 
         templates = config.get("templates", {})
 
@@ -295,66 +368,49 @@ class FeatureDemo:
         print("\n⚡ ДЕМОНСТРАЦИЯ МЕТРИК ПРОИЗВОДИТЕЛЬНОСТИ")
         print("-" * 40)
 
-        # Загружаем историю обработки
-        history_file = self.base_dir / "processing_history.json"
+        # История обработки процессора (data/processing_history.jsonl и
+        # прежний data/processing_history.json)
+        data_dir = self.base_dir / "data"
 
-        if not history_file.exists():
+        if not any(
+            (data_dir / name).exists()
+            for name in ("processing_history.jsonl", "processing_history.json")
+        ):
             print("❌ История обработки не найдена")
             return
 
-        with open(history_file, "r", encoding="utf-8") as f:
-            history = json.load(f)
-
-        if not history:
+        # Один проход по истории: общие и по типам документов агрегаты
+        overall = _HistoryStats()
+        doc_types = defaultdict(_HistoryStats)
+        add_overall = overall.add
+        for record in _iter_history(data_dir):
+            processing_time = record["processing_time"]
+            quality = record["quality_after"]
+            add_overall(processing_time, quality)
+            doc_types[record["document_type"]].add(processing_time, quality)
+
+        if not overall.count:
             print("❌ История обработки пуста")
             return
 
-        print(f"📊 Записей в истории: {len(history)}")
-
-        # Анализ производительности
-        processing_times = [record["processing_time"] for record in history]
-        quality_scores = [record["quality_after"] for record in history]
-
-        avg_time = sum(processing_times) / len(processing_times)
-        min_time = min(processing_times)
-        max_time = max(processing_times)
-
-        avg_quality = sum(quality_scores) / len(quality_scores)
-        min_quality = min(quality_scores)
-        max_quality = max(quality_scores)
+        print(f"📊 Записей в истории: {overall.count}")
 
         print(f"\n⏱️  ВРЕМЯ ОБРАБОТКИ:")
-        print(f"   Среднее: {avg_time:.3f}с")
-        print(f"   Минимальное: {min_time:.3f}с")
-        print(f"   Максимальное: {max_time:.3f}с")
+        print(f"   Среднее: {overall.avg_time:.3f}с")
+        print(f"   Минимальное: {overall.min_time:.3f}с")
+        print(f"   Максимальное: {overall.max_time:.3f}с")
 
         print(f"\n📊 КАЧЕСТВО ОБРАБОТКИ:")
-        print(f"   Среднее: {avg_quality:.1f}/100")
-        print(f"   Минимальное: {min_quality:.1f}/100")
-        print(f"   Максимальное: {max_quality:.1f}/100")
-
-        # Статистика по типам документов
-        doc_types = {}
-        for record in history:
-            doc_type = record["document_type"]
-            if doc_type not in doc_types:
-                doc_types[doc_type] = {"count": 0, "avg_quality": 0, "avg_time": 0}
-
-            doc_types[doc_type]["count"] += 1
-            doc_types[doc_type]["avg_quality"] += record["quality_after"]
-            doc_types[doc_type]["avg_time"] += record["processing_time"]
-
-        # Вычисляем средние значения
-        for doc_type, stats in doc_types.items():
-            stats["avg_quality"] /= stats["count"]
-            stats["avg_time"] /= stats["count"]
+        print(f"   Среднее: {overall.avg_quality:.1f}/100")
+        print(f"   Минимальное: {overall.min_quality:.1f}/100")
+        print(f"   Максимальное: {overall.max_quality:.1f}/100")
 
         print(f"\n📋 СТАТИСТИКА ПО ТИПАМ ДОКУМЕНТОВ:")
         for doc_type, stats in doc_types.items():
             print(f"   {doc_type}:")
-            print(f"     Количество: {stats['count']}")
-            print(f"     Ср. качество: {stats['avg_quality']:.1f}/100")
-            print(f"     Ср. время: {stats['avg_time']:.3f}с")
+            print(f"     Количество: {stats.count}")
+            print(f"     Ср. качество: {stats.avg_quality:.1f}/100")
+            print(f"     Ср. время: {stats.avg_time:.3f}с")
 
     def demo_comparison(self):
         """Демонстрация сравнения разных процессоров"""
@@ -362,7 +418,7 @@ class FeatureDemo:
         print("\n🔄 ДЕМОНСТРАЦИЯ СРАВНЕНИЯ ПРОЦЕССОРОВ")
         print("-" * 40)
 
-        sample_file = self.conversion_dir / "Архивист.md"
+        sample_file = self.conversion_dir / self.SAMPLE_FILENAME
 
         if not sample_file.exists():
             print("❌ Файл для демонстрации не найден")
@@ -373,9 +429,7 @@ class FeatureDemo:
         # Создаем копию файла для тестирования
         test_file = self.base_dir / "temp_test.md"
 
-        with open(sample_file, "r", encoding="utf-8") as src:
-            with open(test_file, "w", encoding="utf-8") as dst:
-                dst.write(src.read())
+        test_file.write_bytes(_read_bytes(sample_file))
 
         processors = [
             ("Улучшенный процессор", self.enhanced_processor),
@@ -452,6 +506,24 @@ class FeatureDemo:
         if test_file.exists():
             test_file.unlink()
 
+    def _run_demo(self, demo_func) -> None:
+        """Запуск одной демонстрации с буферизацией вывода
+
+        В терминале вывод идет построчно, а при перенаправлении в файл или
+        лог весь вывод демонстрации собирается в буфер и пишется одной записью.
+        """
+        if sys.stdout.isatty():
+            demo_func()
+            return
+
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                demo_func()
+        finally:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+
     def run_full_demo(self):
         """Запуск полной демонстрации"""
 
@@ -471,7 +543,7 @@ class FeatureDemo:
 
         for demo_name, demo_func in demos:
             try:
-                demo_func()
+                self._run_demo(demo_func)
                 time.sleep(1)  # Небольшая пауза между демонстрациями
             except Exception as e:
                 print(f"\n❌ Ошибка в демонстрации '{demo_name}': {e}")
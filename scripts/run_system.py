@@ -8,8 +8,12 @@ import sys
 import subprocess
 from pathlib import Path
 
+SCRIPTS_DIR = Path(__file__).parent
+BASE_DIR = SCRIPTS_DIR.parent
+PACKAGE_DIR = BASE_DIR / "src" / "docxmd_converter"
+
 # Добавляем путь к src для импортов
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(BASE_DIR / "src"))
 
 
 def print_banner():
@@ -37,14 +41,14 @@ def print_menu():
 def run_intelligent_processor():
     """Запуск интеллектуального процессора"""
     print("\n🧠 Запуск интеллектуального процессора...")
-    script_path = Path(__file__).parent.parent / "src" / "docxmd_converter" / "intelligent_processor.py"
+    script_path = PACKAGE_DIR / "intelligent_processor.py"
     subprocess.run([sys.executable, str(script_path)])
 
 
 def run_demo():
     """Запуск демонстрации"""
     print("\n🎭 Запуск демонстрации всех возможностей...")
-    script_path = Path(__file__).parent / "demo_all_features.py"
+    script_path = SCRIPTS_DIR / "demo_all_features.py"
     subprocess.run([sys.executable, str(script_path)])
 
 
@@ -55,7 +59,7 @@ def run_web_interface():
     print("⚠️  Убедитесь, что Flask установлен: pip install flask")
 
     try:
-        script_path = Path(__file__).parent.parent / "src" / "docxmd_converter" / "web_interface.py"
+        script_path = PACKAGE_DIR / "web_interface.py"
         subprocess.run([sys.executable, str(script_path)])
     except KeyboardInterrupt:
         print("\n🛑 Веб-сервер остановлен")
@@ -69,14 +73,20 @@ def run_gui():
         run()
     except ImportError as e:
         print(f"❌ Ошибка импорта GUI: {e}")
-        script_path = Path(__file__).parent.parent / "src" / "docxmd_converter" / "gui.py"
+        script_path = PACKAGE_DIR / "gui.py"
         subprocess.run([sys.executable, str(script_path)])
 
 
 def show_cli_help():
     """Показать помощь CLI"""
     print("\n⚙️  CLI интерфейс - справка:")
-    subprocess.run([sys.executable, "-m", "docxmd_converter.cli", "--help"])
+    try:
+        # Справку печатаем в этом же процессе, без запуска нового интерпретатора
+        from docxmd_converter.cli import create_parser
+        create_parser().print_help()
+    except ImportError as e:
+        print(f"❌ Ошибка импорта CLI: {e}")
+        subprocess.run([sys.executable, "-m", "docxmd_converter.cli", "--help"])
 
 
 def run_tests():
@@ -84,13 +94,12 @@ def run_tests():
     print("\n🧪 Запуск тестирования системы...")
 
     # Проверяем основные компоненты
-    base_path = Path(__file__).parent.parent
     components = [
-        (base_path / "src" / "docxmd_converter" / "intelligent_processor.py", "Интеллектуальный процессор"),
-        (base_path / "config" / "document_templates.json", "Конфигурация шаблонов"),
-        (base_path / "src" / "docxmd_converter" / "core.py", "Основной модуль"),
-        (base_path / "src" / "docxmd_converter" / "gui.py", "GUI интерфейс"),
-        (base_path / "src" / "docxmd_converter" / "web_interface.py", "Веб-интерфейс")
+        (PACKAGE_DIR / "intelligent_processor.py", "Интеллектуальный процессор"),
+        (BASE_DIR / "config" / "document_templates.json", "Конфигурация шаблонов"),
+        (PACKAGE_DIR / "core.py", "Основной модуль"),
+        (PACKAGE_DIR / "gui.py", "GUI интерфейс"),
+        (PACKAGE_DIR / "web_interface.py", "Веб-интерфейс")
     ]
 
     print("📋 Проверка компонентов:")
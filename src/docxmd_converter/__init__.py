@@ -2,11 +2,19 @@
 Основной пакет DocxMD Converter
 """
 
-from .intelligent_processor import IntelligentProcessor
-from .core import DocxMdConverter
-from .nlp_analyzer import NLPAnalyzer
-from .quality_assessor import IntelligentQualityAssessor
-from .models import DocumentFeatures, ProcessingResult, QualityAssessment
+import importlib
+
+# Классы загружаются при первом обращении (PEP 562), чтобы импорт пакета
+# и запуск CLI не тянули за собой NLP-модули и pypandoc
+_LAZY_IMPORTS = {
+    'IntelligentProcessor': '.intelligent_processor',
+    'DocxMdConverter': '.core',
+    'NLPAnalyzer': '.nlp_analyzer',
+    'IntelligentQualityAssessor': '.quality_assessor',
+    'DocumentFeatures': '.models',
+    'ProcessingResult': '.models',
+    'QualityAssessment': '.models',
+}
 
 __all__ = [
     'IntelligentProcessor',
@@ -16,4 +24,17 @@ __all__ = [
     'DocumentFeatures',
     'ProcessingResult',
     'QualityAssessment',
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
@@ -62,6 +62,12 @@ Examples:
         help="Path to .docx template file (only for md2docx direction)",
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of files converted in parallel (default: number of CPUs)",
+    )
+
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose logging"
     )
@@ -123,6 +129,9 @@ def validate_args(args: argparse.Namespace) -> None:
     if not src_path.is_dir():
         raise ConversionError(f"Source path is not a directory: {args.src}")
 
+    if args.workers is not None and args.workers < 1:
+        raise ConversionError("Number of workers must be at least 1")
+
     # Validate template if provided
     if args.template:
         if args.format != "md2docx":
@@ -161,6 +170,7 @@ def main() -> int:
             dry_run_process=args.dry_run_process,
             report_format=args.report,
             report_update=args.report_update,
+            max_workers=args.workers,
         )
 
         # Support both 2-tuple (successful, total) and 3-tuple (successful, total, processing_results)
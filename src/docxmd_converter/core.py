@@ -3,11 +3,16 @@ Core functionality for document conversion between .docx and .md formats.
 """
 
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Tuple, Union
 
 import pypandoc
 
+from .file_utils import iter_files
+
 
 class ConversionError(Exception):
     """Custom exception for conversion errors."""
@@ -15,6 +20,16 @@ class ConversionError(Exception):
     pass
 
 
+@lru_cache(maxsize=1)
+def _pandoc_version() -> str:
+    """Return the installed pandoc version.
+
+    ``pandoc --version`` runs once per process; a failed lookup (OSError)
+    is not cached.
+    """
+    return pypandoc.get_pandoc_version()
+
+
 class DocxMdConverter:
     """Main converter class for .docx ⇄ .md conversion."""
 
@@ -46,7 +61,7 @@ class DocxMdConverter:
     def _check_pandoc(self) -> None:
         """Check if pandoc is available."""
         try:
-            version = pypandoc.get_pandoc_version()
+            version = _pandoc_version()
             self.logger.info(f"Pandoc version: {version}")
         except OSError:
             raise ConversionError(
@@ -142,6 +157,7 @@ class DocxMdConverter:
         dry_run_process: bool = False,
         report_format: str = "console",
         report_update: bool = False,
+        max_workers: Optional[int] = None,
     ) -> Tuple[int, int]:
         """Convert all files in directory recursively with optional post-processing.
 
@@ -156,6 +172,8 @@ class DocxMdConverter:
             dry_run_process: Show what would be processed without making changes
             report_format: Report output format ('console' or 'file')
             report_update: Update existing report file instead of creating new one
+            max_workers: Number of files converted concurrently, each in its own
+                pandoc process (default: min(CPU count, number of files))
 
         Returns:
             Tuple of (successful_conversions, total_files)
@@ -168,16 +186,18 @@ class DocxMdConverter:
 
         # Determine file extension to search for
         if format == "docx2md":
-            file_pattern = "*.docx"
+            input_ext = ".docx"
             output_ext = ".md"
         elif format == "md2docx":
-            file_pattern = "*.md"
+            input_ext = ".md"
             output_ext = ".docx"
         else:
             raise ConversionError(f"Invalid format: {format}")
 
+        file_pattern = f"*{input_ext}"
+
         # Find all files to convert
-        files_to_convert = list(src_dir.rglob(file_pattern))
+        files_to_convert = list(iter_files(src_dir, input_ext))
 
         if not files_to_convert:
             self.logger.warning(f"No {file_pattern} files found in {src_dir}")
@@ -195,18 +215,28 @@ class DocxMdConverter:
 
             return 0, 0
 
-        successful_conversions = 0
         total_files = len(files_to_convert)
 
         self.logger.info(f"Found {total_files} files to convert")
 
-        for input_file in files_to_convert:
-            # Calculate relative path to preserve directory structure
-            relative_path = input_file.relative_to(src_dir)
-            output_file = dst_dir / relative_path.with_suffix(output_ext)
+        # Calculate relative paths to preserve directory structure
+        output_files = [
+            dst_dir / input_file.relative_to(src_dir).with_suffix(output_ext)
+            for input_file in files_to_convert
+        ]
+
+        def convert(input_file: Path, output_file: Path) -> bool:
+            return self.convert_file(input_file, output_file, format, template_path)
 
-            if self.convert_file(input_file, output_file, format, template_path):
-                successful_conversions += 1
+        # Each conversion waits on a pandoc subprocess, so threads overlap them
+        workers = min(max_workers or os.cpu_count() or 1, total_files)
+        if workers <= 1:
+            results = map(convert, files_to_convert, output_files)
+            successful_conversions = sum(results)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(convert, files_to_convert, output_files)
+                successful_conversions = sum(results)
 
         self.logger.info(
             f"Conversion completed: {successful_conversions}/{total_files} files"
@@ -0,0 +1,29 @@
+"""
+File system helpers shared by the converter and the intelligent processor.
+"""
+
+import os
+from pathlib import Path
+from typing import Iterator, Union
+
+
+def iter_files(directory: Union[str, Path], suffix: str) -> Iterator[Path]:
+    """Recursively yield files ending with ``suffix`` using ``os.scandir``.
+
+    Files of a directory are yielded before its subdirectories are visited,
+    matching the order of ``Path.rglob``. Symlinked directories are not
+    followed. The walk uses an explicit stack, so deep trees do not hit the
+    recursion limit.
+    """
+    stack = [directory]
+    while stack:
+        subdirs = []
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(suffix) and entry.is_file():
+                    yield Path(entry.path)
+
+        # Reversed so that the first subdirectory is popped (visited) first
+        stack.extend(reversed(subdirs))
@@ -8,9 +8,11 @@ import threading
 import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox, scrolledtext, ttk
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from .core import ConversionError, DocxMdConverter
+# .core pulls in pypandoc; it is imported where conversion actually happens
+if TYPE_CHECKING:
+    from .core import DocxMdConverter
 
 
 class LogHandler(logging.Handler):
@@ -54,7 +56,7 @@ class DocxMdConverterGUI:
         self.force_process = tk.BooleanVar()
         self.dry_run_process = tk.BooleanVar()
 
-        self.converter: Optional[DocxMdConverter] = None
+        self.converter: Optional["DocxMdConverter"] = None
         self.conversion_thread: Optional[threading.Thread] = None
 
         self._create_widgets()
@@ -385,6 +387,8 @@ class DocxMdConverterGUI:
 
     def _validate_inputs(self) -> None:
         """Validate user inputs."""
+        from .core import ConversionError
+
         if not self.src_dir.get():
             raise ConversionError("Please select a source directory")
 
@@ -418,6 +422,8 @@ class DocxMdConverterGUI:
             messagebox.showwarning("Warning", "Conversion is already in progress!")
             return
 
+        from .core import ConversionError
+
         try:
             self._validate_inputs()
         except ConversionError as e:
@@ -440,6 +446,8 @@ class DocxMdConverterGUI:
 
     def _run_conversion(self) -> None:
         """Run the actual conversion (in separate thread)."""
+        from .core import DocxMdConverter
+
         try:
             # Initialize converter
             log_level = "DEBUG" if self.verbose.get() else "INFO"
@@ -536,6 +544,8 @@ class DocxMdConverterGUI:
 
     def run(self) -> None:
         """Start the GUI application."""
+        from .core import ConversionError, DocxMdConverter
+
         try:
             # Check if pandoc is available
             DocxMdConverter()._check_pandoc()
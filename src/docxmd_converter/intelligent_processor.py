@@ -8,22 +8,117 @@ import hashlib
 import json
 import os
 import re
-import statistics
+import shutil
+import sys
+import tempfile
 import time
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
 from datetime import datetime
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from .file_utils import iter_files
 from .models import DocumentFeatures, ProcessingMetrics, QualityAssessment, ProcessingResult
 from .nlp_analyzer import NLPAnalyzer
+from .pool_utils import map_in_pool, pool_size
 from .quality_assessor import IntelligentQualityAssessor
 
+try:
+    import orjson
+
+    def _json_line(record: Dict) -> bytes:
+        """Запись истории в виде строки JSON Lines"""
+        return orjson.dumps(record) + b"\n"
+
+    def _json_indented(data: Dict) -> str:
+        """JSON с отступом в 2 пробела"""
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
+
+except ImportError:
+    # orjson необязателен: без него используем стандартный json
+    def _json_line(record: Dict) -> bytes:
+        """Запись истории в виде строки JSON Lines"""
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def _json_indented(data: Dict) -> str:
+        """JSON с отступом в 2 пробела"""
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+# Артефакты конвертации: блоки ":::", линии из "_" и "*", закладки Word
+_ARTIFACTS_RE = re.compile(r"::: \{[^}]*\}|:::|_{5,}|\*{3,}|_Toc\d+|_Ref\d+")
+_EXTRA_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+# Извлечение данных
+_POSITION_TITLE_RE = re.compile(
+    r"#\s*(?:должностная\s+инструкция[:\s]*)?(.+)", re.IGNORECASE
+)
+# Период отчета: маркер - подстрока, без которой шаблон заведомо не совпадет
+_REPORT_PERIOD_PATTERNS = (
+    ("за", re.compile(r"за\s+(\d{4})\s+год")),
+    ("за", re.compile(r"за\s+(\w+\s+\d{4})")),
+    ("период", re.compile(r"период[:\s]*(.+?)(?=\n|$)")),
+)
+
+# Форматирование и структура
+_HEADING_NO_SPACE_RE = re.compile(r"^(##|###)([^\s#])", re.MULTILINE)
+_BULLET_MARKER_RE = re.compile(r"^(\s*)([•·▪▫])\s*", re.MULTILINE)
+_EXTRA_SPACES_RE = re.compile(r" +$|( ) +", re.MULTILINE)
+_H2_TEXT_RE = re.compile(r"^##\s+(.+)$", re.MULTILINE)
+_TITLE_BLOCK_RE = re.compile(r"(^#\s+.+\n\n)", re.MULTILINE)
+_NUMBERED_SECTION_RE = re.compile(r"##\s+\d+\.")
+_NUMBERED_ITEM_RE = re.compile(r"\d+\.")
+
+# Неизменный раздел метаданных о способе обработки
+_PROCESSING_METADATA = {
+    "method": "intelligent_nlp_processing",
+    "ai_enhanced": True,
+    "quality_assured": True,
+    "machine_learning_ready": True,
+}
+
+
+@lru_cache(maxsize=8)
+def _read_config(config_path: str) -> Dict:
+    """Чтение конфигурации, кэшируется по пути
+
+    Возвращаемый словарь общий для всех процессоров и не должен изменяться
+    """
+    with open(config_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 
 class IntelligentProcessor:
     """Интеллектуальный процессор документов"""
 
+    # Ключевые слова для определения типа документа
+    _TYPE_KEYWORDS = (
+        "должностн", "инструкци", "обязанности", "права", "ответственность",
+        "отчет", "результат", "анализ", "вывод",
+        "положени", "общие положения", "цели", "задачи",
+        "порядок", "алгоритм",
+    )
+
+    # Веса отдельных ключевых слов по типам (сочетания учитываются в коде)
+    _TYPE_KEYWORD_WEIGHTS = {
+        "должностная_инструкция": (
+            ("обязанности", 10), ("права", 10), ("ответственность", 10),
+        ),
+        "отчет": (("отчет", 20), ("результат", 10), ("анализ", 10), ("вывод", 10)),
+        "положение": (("положени", 20), ("общие положения", 15)),
+        "инструкция": (("порядок", 10), ("алгоритм", 10)),
+    }
+
+    # Сколько результатов NLP-анализа хранить в кэше процессора
+    _NLP_CACHE_SIZE = 128
+
+    # Сколько следующих файлов пакета читается заранее, пока идет NLP-анализ
+    _PREFETCH_WINDOW = 8
+
     def __init__(self, config_path: str = None):
         # Определяем базовую директорию относительно текущего файла
         current_file = Path(__file__).resolve()
@@ -33,65 +128,151 @@ class IntelligentProcessor:
         if config_path is None:
             config_path = str(self.base_dir / "config" / "document_templates.json")
 
+        self.config_path = config_path
         self.config = self._load_config(config_path)
-        self.nlp_analyzer = NLPAnalyzer()
-        self.quality_assessor = IntelligentQualityAssessor()
+
+        # Результаты NLP-анализа по хэшу содержимого документа
+        self._nlp_cache: Dict[str, Tuple[DocumentFeatures, Dict, Dict]] = {}
 
         # История обработки для машинного обучения
         self.processing_history = []
 
+        # Общая отметка времени для метаданных документов одного пакета
+        self._batch_timestamp: Optional[str] = None
+
+    def __getstate__(self):
+        # В рабочие процессы пула не передаются кэш NLP-анализа, история и
+        # созданные анализаторы: процесс создает свои при первом обращении
+        state = self.__dict__.copy()
+        state.pop("nlp_analyzer", None)
+        state.pop("quality_assessor", None)
+        state["_nlp_cache"] = {}
+        state["processing_history"] = []
+        return state
+
+    # Анализаторы создаются при первом обращении: родительскому процессу
+    # пакетной обработки в пуле они не нужны
+    @cached_property
+    def nlp_analyzer(self) -> NLPAnalyzer:
+        return NLPAnalyzer()
+
+    @cached_property
+    def quality_assessor(self) -> IntelligentQualityAssessor:
+        return IntelligentQualityAssessor()
+
     def _load_config(self, config_path: str) -> Dict:
         """Загрузка конфигурации"""
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return _read_config(config_path)
         except Exception as e:
             print(f"❌ Ошибка загрузки конфигурации: {e}")
             return {"templates": {}}
 
+    @staticmethod
+    def _read_document(file_path: str) -> str:
+        """Чтение документа целиком"""
+        # Читаем файл целиком в байтах и декодируем за один вызов
+        content = Path(file_path).read_bytes().decode("utf-8")
+        if "\r" in content:
+            # Та же нормализация переводов строк, что и в текстовом режиме
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return content
+
+    @staticmethod
+    def _write_document(file_path: str, parts: Iterable[str]) -> None:
+        """Атомарная запись документа, переданного частями
+
+        Содержимое пишется в уникальный временный файл в той же директории,
+        сбрасывается на диск и подменяет исходный через os.replace, поэтому
+        сбой записи не портит исходный документ. Права доступа исходного
+        файла сохраняются
+        """
+        directory, name = os.path.split(os.path.abspath(file_path))
+        tmp = tempfile.NamedTemporaryFile(
+            dir=directory, prefix=f".{name}.", suffix=".tmp", delete=False
+        )
+        try:
+            with tmp:
+                if os.path.exists(file_path):
+                    shutil.copymode(file_path, tmp.name)
+                for part in parts:
+                    tmp.write(part.encode("utf-8"))
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp.name, file_path)
+        except BaseException:
+            if os.path.exists(tmp.name):
+                os.remove(tmp.name)
+            raise
+
     def process_document_intelligently(self, file_path: str) -> Dict[str, Any]:
         """Интеллектуальная обработка документа"""
 
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
-            # Читаем файл
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = self._read_document(file_path)
+        except Exception as e:
+            processing_time = time.perf_counter() - start_time
+            return {
+                "success": False,
+                "error": str(e),
+                "processing_time": processing_time,
+            }
+
+        return self._process_loaded(file_path, content, start_time)
 
-            # Отделяем метаданные
-            if "<!-- METADATA" in content:
-                main_content, metadata_part = content.split("<!-- METADATA", 1)
-            else:
-                main_content = content
-                metadata_part = ""
+    def _process_loaded(
+        self, file_path: str, content: str, start_time: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Обработка уже прочитанного документа
+
+        start_time - отметка time.perf_counter() начала обработки
+        """
+
+        if start_time is None:
+            start_time = time.perf_counter()
+
+        try:
+            # Отделяем метаданные (старый блок метаданных не копируется)
+            metadata_start = content.find("<!-- METADATA")
+            main_content = content if metadata_start == -1 else content[:metadata_start]
 
             # Анализируем документ
-            features = self.nlp_analyzer.extract_features(main_content)
-            entities = self.nlp_analyzer.extract_entities(main_content)
-            sentiment = self.nlp_analyzer.analyze_sentiment(main_content)
+            features, entities, sentiment = self._analyze_content(main_content)
+
+            # Одна копия текста в нижнем регистре на весь анализ
+            content_lower = main_content.lower()
 
             # Определяем тип документа
             document_type, confidence = self._intelligent_type_detection(
-                main_content, features, entities or {}
+                main_content, features, entities or {}, content_lower
             )
 
             # Извлекаем структурированные данные
-            extracted_data = self._extract_structured_data(main_content, document_type)
+            extracted_data = self._extract_structured_data(
+                main_content, document_type, entities, content_lower
+            )
 
             # Оцениваем качество
             quality_assessment = self.quality_assessor.assess_quality(
-                main_content, features, document_type, extracted_data or {}
+                main_content, features, document_type, extracted_data or {},
+                content_lower
             )
+            del content_lower  # копия в нижнем регистре дальше не нужна
 
             # Применяем интеллектуальные улучшения
             improved_content = self._apply_intelligent_improvements(
                 main_content, document_type, quality_assessment, extracted_data or {}
             )
 
+            # Признаки в виде словаря нужны и в метаданных, и в истории
+            filename = Path(file_path).name
+            features_dict = asdict(features)
+
             # Создаем расширенные метаданные
             enhanced_metadata = self._create_enhanced_metadata(
-                Path(file_path).name,
+                filename,
                 document_type,
                 confidence,
                 features,
@@ -99,22 +280,23 @@ class IntelligentProcessor:
                 sentiment or {},
                 quality_assessment,
                 extracted_data or {},
+                features_dict=features_dict,
             )
 
-            # Сохраняем результат
-            final_content = improved_content.strip() + "\n\n" + enhanced_metadata
-
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(final_content)
+            # Сохраняем результат: текст и метаданные пишутся по частям, без
+            # промежуточной строки со всем документом
+            self._write_document(
+                file_path, (improved_content.strip(), "\n\n", enhanced_metadata)
+            )
 
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
 
             # Сохраняем в историю для обучения
             processing_record = {
-                "filename": Path(file_path).name,
+                "filename": filename,
                 "document_type": document_type,
                 "confidence": confidence,
-                "features": asdict(features),
+                "features": features_dict,
                 "quality_before": 0,  # Можно добавить оценку до обработки
                 "quality_after": quality_assessment.overall_score,
                 "processing_time": processing_time,
@@ -136,76 +318,70 @@ class IntelligentProcessor:
             }
 
         except Exception as e:
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             return {
                 "success": False,
                 "error": str(e),
                 "processing_time": processing_time,
             }
 
+    def _analyze_content(self, content: str) -> Tuple[DocumentFeatures, Dict, Dict]:
+        """Признаки, сущности и тональность документа
+
+        Для уже встречавшегося содержимого результат берется из кэша
+        """
+        key = hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+        analysis = self._nlp_cache.get(key)
+        if analysis is None:
+            analysis = self.nlp_analyzer.analyze(content)
+            if len(self._nlp_cache) >= self._NLP_CACHE_SIZE:
+                # Вытесняем самую старую запись
+                del self._nlp_cache[next(iter(self._nlp_cache))]
+            self._nlp_cache[key] = analysis
+
+        return analysis
+
     def _intelligent_type_detection(
-        self, content: str, features: DocumentFeatures, entities: Dict
+        self,
+        content: str,
+        features: DocumentFeatures,
+        entities: Dict,
+        content_lower: Optional[str] = None,
     ) -> Tuple[str, float]:
         """Интеллектуальное определение типа документа"""
 
-        content_lower = content.lower()
+        if content_lower is None:
+            content_lower = content.lower()
 
-        # Базовые паттерны
-        type_scores = {}
+        # Каждое ключевое слово ищется в тексте один раз
+        hits = {keyword for keyword in self._TYPE_KEYWORDS if keyword in content_lower}
+
+        # Базовые оценки по отдельным словам
+        type_scores = {
+            doc_type: sum(weight for keyword, weight in weights if keyword in hits)
+            for doc_type, weights in self._TYPE_KEYWORD_WEIGHTS.items()
+        }
 
         # Должностная инструкция
-        job_desc_score = 0
-        if "должностн" in content_lower and "инструкци" in content_lower:
-            job_desc_score += 20
-        if "обязанности" in content_lower:
-            job_desc_score += 10
-        if "права" in content_lower:
-            job_desc_score += 10
-        if "ответственность" in content_lower:
-            job_desc_score += 10
+        if "должностн" in hits and "инструкци" in hits:
+            type_scores["должностная_инструкция"] += 20
         if entities.get("positions"):
-            job_desc_score += 15
-
-        type_scores["должностная_инструкция"] = job_desc_score
+            type_scores["должностная_инструкция"] += 15
 
         # Отчет
-        report_score = 0
-        if "отчет" in content_lower:
-            report_score += 20
-        if "результат" in content_lower:
-            report_score += 10
-        if "анализ" in content_lower:
-            report_score += 10
-        if "вывод" in content_lower:
-            report_score += 10
         if entities.get("dates"):
-            report_score += 10
-
-        type_scores["отчет"] = report_score
+            type_scores["отчет"] += 10
 
         # Положение
-        regulation_score = 0
-        if "положени" in content_lower:
-            regulation_score += 20
-        if "общие положения" in content_lower:
-            regulation_score += 15
-        if "цели" in content_lower and "задачи" in content_lower:
-            regulation_score += 10
-
-        type_scores["положение"] = regulation_score
+        if "цели" in hits and "задачи" in hits:
+            type_scores["положение"] += 10
 
         # Инструкция
-        instruction_score = 0
-        if "инструкци" in content_lower and "должностн" not in content_lower:
-            instruction_score += 20
-        if "порядок" in content_lower:
-            instruction_score += 10
-        if "алгоритм" in content_lower:
-            instruction_score += 10
+        if "инструкци" in hits and "должностн" not in hits:
+            type_scores["инструкция"] += 20
         if features.list_count > 5:  # Много списков - признак инструкции
-            instruction_score += 10
-
-        type_scores["инструкция"] = instruction_score
+            type_scores["инструкция"] += 10
 
         # Определяем лучший тип
         if type_scores:
@@ -219,50 +395,80 @@ class IntelligentProcessor:
         return "общий_документ", 0.1
 
     def _extract_structured_data(
-        self, content: str, document_type: str
+        self,
+        content: str,
+        document_type: str,
+        entities: Optional[Dict] = None,
+        content_lower: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Извлечение структурированных данных с учетом типа документа"""
+        """Извлечение структурированных данных с учетом типа документа
+
+        entities и content_lower - уже извлеченные сущности и текст в нижнем
+        регистре; если не переданы, вычисляются заново
+        """
 
         extracted = {}
-        content_lower = content.lower()
 
         # Общие данные
-        entities = self.nlp_analyzer.extract_entities(content)
+        if entities is None:
+            entities = self.nlp_analyzer.extract_entities(content)
         if entities:
             extracted.update(entities)
 
+        # Текст в нижнем регистре нужен только для части типов
+        if content_lower is None and document_type in ("должностная_инструкция", "отчет"):
+            content_lower = content.lower()
+
         # Специфичные для типа данные
         if document_type == "должностная_инструкция":
             # Извлекаем название должности из заголовка
-            title_match = re.search(
-                r"#\s*(?:должностная\s+инструкция[:\s]*)?(.+)", content, re.IGNORECASE
-            )
+            title_match = "#" in content and _POSITION_TITLE_RE.search(content)
             if title_match:
                 extracted["position"] = title_match.group(1).strip()
 
             # Извлекаем функции
-            functions_match = re.search(
-                r"функции[:\s]*(.*?)(?=\n\n|\n##|$)", content_lower, re.DOTALL
-            )
-            if functions_match:
-                extracted["functions"] = functions_match.group(1).strip()
+            functions = self._extract_functions_block(content_lower)
+            if functions is not None:
+                extracted["functions"] = functions
 
         elif document_type == "отчет":
             # Извлекаем период отчета
-            period_patterns = [
-                r"за\s+(\d{4})\s+год",
-                r"за\s+(\w+\s+\d{4})",
-                r"период[:\s]*(.+?)(?=\n|$)",
-            ]
-
-            for pattern in period_patterns:
-                match = re.search(pattern, content_lower)
+            for marker, pattern in _REPORT_PERIOD_PATTERNS:
+                if marker not in content_lower:
+                    continue
+                match = pattern.search(content_lower)
                 if match:
                     extracted["report_period"] = match.group(1).strip()
                     break
 
         return extracted
 
+    def _extract_functions_block(self, content_lower: str) -> Optional[str]:
+        """Текст после слова «функции» до пустой строки или подзаголовка
+
+        Линейный поиск вместо DOTALL-шаблона с ленивым квантификатором и
+        просмотром вперед, который проверяется на каждой позиции документа.
+        """
+        start = content_lower.find("функции")
+        if start == -1:
+            return None
+
+        # Пропускаем двоеточия и пробельные символы после слова
+        start += len("функции")
+        length = len(content_lower)
+        while start < length and (
+            content_lower[start] == ":" or content_lower[start].isspace()
+        ):
+            start += 1
+
+        end = length
+        for stop in ("\n\n", "\n##"):
+            pos = content_lower.find(stop, start)
+            if pos != -1 and pos < end:
+                end = pos
+
+        return content_lower[start:end].strip()
+
     def _apply_intelligent_improvements(
         self,
         content: str,
@@ -276,22 +482,24 @@ class IntelligentProcessor:
 
         # Исправляем критические проблемы
         for issue in quality_assessment.critical_issues:
-            if "артефакты" in issue.lower():
+            issue_lower = issue.lower()
+            if "артефакты" in issue_lower:
                 improved = self._remove_artifacts(improved)
-            elif "заголовки" in issue.lower():
+            elif "заголовки" in issue_lower:
                 improved = self._add_missing_headers(improved, document_type)
-            elif "незаполненные разделы" in issue.lower():
+            elif "незаполненные разделы" in issue_lower:
                 improved = self._fill_empty_sections(
                     improved, document_type, extracted_data
                 )
 
         # Применяем рекомендации
         for recommendation in quality_assessment.recommendations:
-            if "форматирование" in recommendation.lower():
+            recommendation_lower = recommendation.lower()
+            if "форматирование" in recommendation_lower:
                 improved = self._improve_formatting(improved)
-            elif "структуру" in recommendation.lower():
+            elif "структуру" in recommendation_lower:
                 improved = self._improve_structure(improved, document_type)
-            elif "согласованность" in recommendation.lower():
+            elif "согласованность" in recommendation_lower:
                 improved = self._improve_consistency(improved)
 
         return improved
@@ -299,15 +507,11 @@ class IntelligentProcessor:
     def _remove_artifacts(self, content: str) -> str:
         """Удаление артефактов"""
 
-        # Удаляем различные артефакты
-        content = re.sub(r"::: \{[^}]*\}", "", content)
-        content = re.sub(r":::", "", content)
-        content = re.sub(r"_{5,}", "", content)
-        content = re.sub(r"\*{3,}", "", content)
-        content = re.sub(r"_Toc\d+|_Ref\d+", "", content)
+        # Удаляем различные артефакты за один проход
+        content = _ARTIFACTS_RE.sub("", content)
 
         # Очищаем лишние пустые строки
-        content = re.sub(r"\n{3,}", "\n\n", content)
+        content = _EXTRA_BLANK_LINES_RE.sub("\n\n", content)
 
         return content
 
@@ -355,16 +559,16 @@ class IntelligentProcessor:
     def _improve_formatting(self, content: str) -> str:
         """Улучшение форматирования"""
 
-        # Исправляем заголовки
-        content = re.sub(r"^##([^\s#])", r"## \1", content, flags=re.MULTILINE)
-        content = re.sub(r"^###([^\s#])", r"### \1", content, flags=re.MULTILINE)
+        # Исправляем заголовки (## и ### за один проход)
+        content = _HEADING_NO_SPACE_RE.sub(r"\1 \2", content)
 
         # Исправляем списки
-        content = re.sub(r"^(\s*)([•·▪▫])\s*", r"\1- ", content, flags=re.MULTILINE)
+        content = _BULLET_MARKER_RE.sub(r"\1- ", content)
 
-        # Удаляем лишние пробелы
-        content = re.sub(r" +$", "", content, flags=re.MULTILINE)
-        content = re.sub(r" {2,}", " ", content)
+        # Удаляем пробелы в конце строк и схлопываем повторы за один проход:
+        # хвостовые пробелы заменяются пустой строкой, остальные повторы - одним
+        # пробелом из группы
+        content = _EXTRA_SPACES_RE.sub(r"\1", content)
 
         return content
 
@@ -373,42 +577,52 @@ class IntelligentProcessor:
 
         # Добавляем содержание если его нет
         if "## Содержание" not in content and content.count("##") > 3:
-            headers = re.findall(r"^##\s+(.+)$", content, re.MULTILINE)
+            headers = _H2_TEXT_RE.findall(content)
             if headers:
-                toc = "## Содержание\n\n"
-                for i, header in enumerate(headers, 1):
-                    toc += f"{i}. {header}\n"
-                toc += "\n"
+                toc_items = "".join(
+                    f"{i}. {header}\n" for i, header in enumerate(headers, 1)
+                )
+                toc = f"## Содержание\n\n{toc_items}\n"
 
                 # Вставляем после заголовка документа
-                content = re.sub(
-                    r"(^#\s+.+\n\n)", r"\1" + toc, content, flags=re.MULTILINE
-                )
+                content = _TITLE_BLOCK_RE.sub(r"\1" + toc, content)
 
         return content
 
     def _improve_consistency(self, content: str) -> str:
         """Улучшение согласованности"""
 
-        # Исправляем нумерацию
+        # Без заголовков второго уровня нумерованных разделов нет
+        if "##" not in content:
+            return content
+
+        # Исправляем нумерацию: регулярные выражения проверяются только для
+        # строк, которые могут совпасть (заголовки и строки с цифрой в начале)
         lines = content.split("\n")
         in_numbered_section = False
         current_section = 0
         item_counter = 1
 
         for i, line in enumerate(lines):
-            if re.match(r"^##\s+\d+\.", line):
-                in_numbered_section = True
-                current_section += 1
-                item_counter = 1
-            elif line.startswith("##"):
-                in_numbered_section = False
-            elif in_numbered_section and re.match(r"^\d+\.", line.strip()):
-                # Исправляем нумерацию
-                lines[i] = re.sub(
-                    r"^\d+\.", f"{current_section}.{item_counter}.", line.strip()
-                )
-                item_counter += 1
+            if line.startswith("##"):
+                if _NUMBERED_SECTION_RE.match(line):
+                    in_numbered_section = True
+                    current_section += 1
+                    item_counter = 1
+                else:
+                    in_numbered_section = False
+            elif in_numbered_section:
+                stripped = line.strip()
+                if not stripped[:1].isdigit():
+                    continue
+                item_match = _NUMBERED_ITEM_RE.match(stripped)
+                if item_match:
+                    # Исправляем нумерацию
+                    lines[i] = (
+                        f"{current_section}.{item_counter}."
+                        + stripped[item_match.end():]
+                    )
+                    item_counter += 1
 
         return "\n".join(lines)
 
@@ -422,10 +636,17 @@ class IntelligentProcessor:
         sentiment: Dict,
         quality_assessment: QualityAssessment,
         extracted_data: Dict,
+        features_dict: Optional[Dict] = None,
     ) -> str:
-        """Создание расширенных метаданных"""
+        """Создание расширенных метаданных
+
+        features_dict - уже преобразованные в словарь признаки документа
+        """
 
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if features_dict is None:
+            features_dict = asdict(features)
+
+        now = self._batch_timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         metadata = {
             "created_at": now,
@@ -437,7 +658,7 @@ class IntelligentProcessor:
             "document_analysis": {
                 "type": document_type,
                 "type_confidence": round(confidence, 3),
-                "features": asdict(features),
+                "features": features_dict,
                 "entities": entities,
                 "sentiment": sentiment,
             },
@@ -455,25 +676,29 @@ class IntelligentProcessor:
             # Извлеченные данные
             "extracted_data": extracted_data,
             # Метаданные обработки
-            "processing_metadata": {
-                "method": "intelligent_nlp_processing",
-                "ai_enhanced": True,
-                "quality_assured": True,
-                "machine_learning_ready": True,
-            },
+            "processing_metadata": _PROCESSING_METADATA,
         }
 
-        return (
-            f"<!-- METADATA\n{json.dumps(metadata, indent=2, ensure_ascii=False)}\n-->"
-        )
+        metadata_json = _json_indented(metadata)
+
+        return f"<!-- METADATA\n{metadata_json}\n-->"
+
+    def process_all_documents(self, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Обработка всех документов с интеллектуальным анализом
 
-    def process_all_documents(self) -> Dict[str, Any]:
-        """Обработка всех документов с интеллектуальным анализом"""
+        Большие пакеты обрабатываются параллельно в пуле процессов (по
+        умолчанию - по числу ядер); пакеты меньше BATCH_POOL_THRESHOLD файлов
+        и при max_workers=1 - в текущем процессе.
+        """
 
         print("🧠 Интеллектуальная обработка документов")
         print("=" * 60)
 
-        md_files = list(self.conversion_dir.glob("**/*.md"))
+        md_files = (
+            list(iter_files(self.conversion_dir, ".md"))
+            if self.conversion_dir.is_dir()
+            else []
+        )
 
         if not md_files:
             print("❌ Файлы MD не найдены")
@@ -484,24 +709,31 @@ class IntelligentProcessor:
         results = []
         total_processing_time = 0
 
-        for md_file in md_files:
-            print(f"\n🔄 Интеллектуальная обработка: {md_file.name}")
-
-            result = self.process_document_intelligently(str(md_file))
-            results.append(result)
-
-            if result["success"]:
-                print(
-                    f"   🧠 Тип: {result['document_type']} (уверенность: {result['confidence']:.2f})"
-                )
-                print(
-                    f"   📊 Качество: {result['quality_assessment'].overall_score:.1f}/100"
-                )
-                print(f"   🔧 Улучшений: {result['improvements_applied']}")
-                print(f"   ⏱️  Время: {result['processing_time']:.2f}с")
-                total_processing_time += result["processing_time"]
-            else:
-                print(f"   ❌ Ошибка: {result['error']}")
+        # Все документы пакета получают одну отметку времени
+        self._batch_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            for md_file, result in self._iter_processed(md_files, max_workers):
+                results.append(result)
+
+                # Отчет по файлу собирается целиком и выводится одной записью
+                report = [f"\n🔄 Интеллектуальная обработка: {md_file.name}\n"]
+
+                if result["success"]:
+                    report.append(
+                        f"   🧠 Тип: {result['document_type']} (уверенность: {result['confidence']:.2f})\n"
+                    )
+                    report.append(
+                        f"   📊 Качество: {result['quality_assessment'].overall_score:.1f}/100\n"
+                    )
+                    report.append(f"   🔧 Улучшений: {result['improvements_applied']}\n")
+                    report.append(f"   ⏱️  Время: {result['processing_time']:.2f}с\n")
+                    total_processing_time += result["processing_time"]
+                else:
+                    report.append(f"   ❌ Ошибка: {result['error']}\n")
+
+                sys.stdout.write("".join(report))
+        finally:
+            self._batch_timestamp = None
 
         # Анализ результатов
         successful_results = [r for r in results if r["success"]]
@@ -509,6 +741,8 @@ class IntelligentProcessor:
         avg_confidence = 0
 
         if successful_results:
+            import statistics
+
             avg_quality = statistics.mean(
                 r["quality_assessment"].overall_score for r in successful_results
             )
@@ -580,25 +814,80 @@ class IntelligentProcessor:
             "results": results,
         }
 
+    def _iter_processed(self, md_files: List[Path], max_workers: Optional[int]):
+        """Пары (файл, результат) в исходном порядке файлов
+
+        В пуле каждый процесс один раз получает копию процессора без кэшей и
+        истории и сам создает NLP-анализатор и оценщик качества, а записи
+        истории возвращаются вместе с результатом и добавляются в историю
+        родительского процесса.
+        """
+        workers = pool_size(len(md_files), max_workers)
+
+        if workers <= 1:
+            yield from self._iter_prefetched(md_files)
+            return
+
+        outcomes = map_in_pool(
+            self, "_process_with_record", [str(md_file) for md_file in md_files], workers
+        )
+        for (result, record), md_file in zip(outcomes, md_files):
+            if record is not None:
+                self.processing_history.append(record)
+            yield md_file, result
+
+    def _process_with_record(self, file_path: str) -> Tuple[Dict[str, Any], Optional[Dict]]:
+        """Обработка одного документа в рабочем процессе пула
+
+        Возвращает результат и запись истории (None при ошибке)
+        """
+        result = self.process_document_intelligently(file_path)
+        record = self.processing_history.pop() if result["success"] else None
+        return result, record
+
+    def _iter_prefetched(self, md_files: List[Path]):
+        """Последовательная обработка с упреждающим чтением файлов
+
+        Пока обрабатывается текущий документ, пул потоков читает следующие
+        (окно _PREFETCH_WINDOW файлов)
+        """
+        window = self._PREFETCH_WINDOW
+
+        with ThreadPoolExecutor(max_workers=window) as reader:
+            pending = deque(
+                reader.submit(self._read_document, str(md_file))
+                for md_file in md_files[:window]
+            )
+
+            for index, md_file in enumerate(md_files):
+                future = pending.popleft()
+                if index + window < len(md_files):
+                    pending.append(
+                        reader.submit(self._read_document, str(md_files[index + window]))
+                    )
+
+                try:
+                    content = future.result()
+                except Exception as e:
+                    yield md_file, {
+                        "success": False,
+                        "error": str(e),
+                        "processing_time": 0.0,
+                    }
+                    continue
+
+                yield md_file, self._process_loaded(str(md_file), content)
+
     def _save_processing_history(self):
         """Сохранение истории обработки для машинного обучения"""
 
-        history_file = self.base_dir / "data" / "processing_history.json"
+        history_file = self.base_dir / "data" / "processing_history.jsonl"
 
         try:
-            # Загружаем существующую историю
-            if history_file.exists():
-                with open(history_file, "r", encoding="utf-8") as f:
-                    existing_history = json.load(f)
-            else:
-                existing_history = []
-
-            # Добавляем новые записи
-            existing_history.extend(self.processing_history)
-
-            # Сохраняем обновленную историю
-            with open(history_file, "w", encoding="utf-8") as f:
-                json.dump(existing_history, f, indent=2, ensure_ascii=False)
+            # История хранится в формате JSON Lines: новые записи дописываются
+            # в конец файла без чтения и перезаписи уже сохраненных
+            with open(history_file, "ab") as f:
+                f.write(b"".join(_json_line(record) for record in self.processing_history))
 
             print(
                 f"\n💾 История обработки сохранена: {len(self.processing_history)} новых записей"
@@ -614,21 +903,24 @@ class IntelligentProcessor:
             return {"message": "История обработки пуста"}
 
         total_files = len(self.processing_history)
-        avg_processing_time = sum(r['processing_time'] for r in self.processing_history) / total_files
-        avg_quality = sum(r['quality_after'] for r in self.processing_history) / total_files
 
-        document_types = {}
+        # Один проход по истории для всех агрегатов
+        total_time = 0
+        total_quality = 0
+        document_types = Counter()
         for record in self.processing_history:
-            doc_type = record['document_type']
-            if doc_type not in document_types:
-                document_types[doc_type] = 0
-            document_types[doc_type] += 1
+            total_time += record['processing_time']
+            total_quality += record['quality_after']
+            document_types[record['document_type']] += 1
+
+        avg_processing_time = total_time / total_files
+        avg_quality = total_quality / total_files
 
         return {
             'total_files_processed': total_files,
             'average_processing_time': avg_processing_time,
             'average_quality_score': avg_quality,
-            'document_types_distribution': document_types,
+            'document_types_distribution': dict(document_types),
             'last_processed': self.processing_history[-1]['timestamp'] if self.processing_history else None
         }
 
@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentFeatures:
     """Признаки документа для анализа"""
 
@@ -23,7 +23,7 @@ class DocumentFeatures:
     formality_score: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingMetrics:
     """Метрики обработки документа"""
 
@@ -34,7 +34,7 @@ class ProcessingMetrics:
     issues_found: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class QualityAssessment:
     """Результат оценки качества документа"""
 
@@ -49,7 +49,7 @@ class QualityAssessment:
     critical_issues: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """Результат обработки документа"""
 
@@ -4,11 +4,86 @@ NLP анализатор для обработки текста документ
 """
 
 import re
-import statistics
 from collections import Counter
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from .models import DocumentFeatures
+from .pool_utils import map_in_pool, pool_size
+
+# Структурные элементы markdown
+_HEADING_RE = re.compile(r'^#+\s+.+$', re.MULTILINE)
+_LIST_ITEM_RE = re.compile(r'^\s*[-*+]\s+.+$', re.MULTILINE)
+_TABLE_ROW_RE = re.compile(r'\|.*\|')
+
+# Слова и предложения
+_MARKUP_CHARS_RE = re.compile(r'[#*_`\[\](){}]')
+_URL_RE = re.compile(r'https?://\S+')
+_WORD_RE = re.compile(r'\b[а-яёa-z]+\b')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+# Признаки формальности
+_SECTION_NUMBER_RE = re.compile(r'\d+\.\d+\.\d+')
+_LEGAL_TERMS_RE = re.compile(r'статья|пункт|подпункт|раздел|глава')
+_FORMAL_DOCUMENT_RE = re.compile(r'должностная инструкция|положение|регламент|приказ')
+
+# Язык документа: буквы считаются по длинам сплошных серий, а не по одной
+_CYRILLIC_RUN_RE = re.compile(r'[а-яё]+')
+_LATIN_RUN_RE = re.compile(r'[a-z]+')
+
+# Именованные сущности
+_DATE_PATTERNS = (
+    re.compile(r'\d{1,2}\.\d{1,2}\.\d{4}', re.IGNORECASE),
+    re.compile(r'\d{1,2}\s+[а-я]+\s+\d{4}', re.IGNORECASE),
+    re.compile(r'\d{4}\s*г\.?', re.IGNORECASE),
+)
+_ORGANIZATION_PATTERNS = (
+    re.compile(r'[А-Я][а-я]+\s+[А-Я][а-я]+\s+[А-Я][а-я]+'),  # Три слова с заглавных
+    re.compile(r'ООО\s+"[^"]+"'),
+    re.compile(r'ЗАО\s+"[^"]+"'),
+    re.compile(r'ОАО\s+"[^"]+"'),
+)
+_POSITION_PATTERNS = tuple(
+    re.compile(rf'\b[а-я]*\s*{keyword}[а-я]*\b')
+    for keyword in (
+        "директор", "менеджер", "специалист", "инженер", "бухгалтер",
+        "секретарь", "администратор", "консультант", "аналитик"
+    )
+)
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+# Словари тональности
+_POSITIVE_WORDS = frozenset({
+    "хорошо", "отлично", "успешно", "эффективно", "качественно",
+    "положительно", "улучшение", "развитие", "достижение"
+})
+_NEGATIVE_WORDS = frozenset({
+    "плохо", "неудовлетворительно", "проблема", "ошибка", "недостаток",
+    "нарушение", "отрицательно", "ухудшение", "снижение"
+})
+
+
+def term_variations(vocabulary: Iterable[str]) -> Set[str]:
+    """Слова словаря, у которых есть вариация
+
+    Вариация - другое слово словаря, содержащее данное или содержащееся в нем,
+    с разницей длины не более 2 символов. Вместо попарного сравнения всех слов
+    для каждого слова проверяются только его подстроки короче на 1-2 символа
+    """
+    vocabulary = set(vocabulary)
+    varied = set()
+
+    for word in vocabulary:
+        length = len(word)
+        for sub_length in (length - 1, length - 2):
+            if sub_length < 1:
+                break
+            for start in range(length - sub_length + 1):
+                sub = word[start:start + sub_length]
+                if sub in vocabulary:
+                    varied.add(word)
+                    varied.add(sub)
+
+    return varied
 
 
 class NLPAnalyzer:
@@ -16,7 +91,7 @@ class NLPAnalyzer:
 
     def __init__(self):
         # Стоп-слова для русского языка (базовый набор)
-        self.stop_words = {
+        self.stop_words = frozenset({
             "и", "в", "на", "с", "по", "для", "от", "до", "при", "за", "под",
             "над", "между", "через", "без", "про", "против", "около", "возле",
             "что", "как", "где", "когда", "почему", "зачем", "который", "какой",
@@ -24,7 +99,7 @@ class NLPAnalyzer:
             "здесь", "там", "везде", "нигде", "всюду", "где-то", "куда-то",
             "не", "ни", "да", "нет", "или", "либо", "то", "если", "хотя",
             "чтобы", "пока", "пусть", "будто", "словно", "точно", "именно"
-        }
+        })
 
         # Формальные слова и фразы
         self.formal_indicators = {
@@ -35,26 +110,74 @@ class NLPAnalyzer:
             "осуществляет", "обеспечивает", "контролирует", "утверждает"
         }
 
+        # Слова последнего разобранного текста: (текст, слова). Методы анализа
+        # часто вызываются подряд для одного и того же текста
+        self._words_cache: Optional[Tuple[str, List[str]]] = None
+
+    def __getstate__(self):
+        # Кэш слов не передается в рабочие процессы пула
+        state = self.__dict__.copy()
+        state['_words_cache'] = None
+        return state
+
+    def analyze(
+        self, text: str
+    ) -> Tuple[DocumentFeatures, Dict[str, List[str]], Dict[str, float]]:
+        """Признаки, сущности и тональность текста за один вызов
+
+        Слова текста и его копия в нижнем регистре строятся один раз
+        и используются всеми видами анализа
+        """
+        words = self._extract_words(text)
+        text_lower = text.lower()
+        return (
+            self._features_from_words(text, words, text_lower),
+            self._entities_from_text(text, text_lower),
+            self._sentiment_from_words(words),
+        )
+
     def extract_features(self, text: str) -> DocumentFeatures:
         """Извлечение признаков из текста"""
+        return self._features_from_words(text, self._extract_words(text))
+
+    def extract_features_batch(self, texts: Iterable[str],
+                               max_workers: Optional[int] = None) -> List[DocumentFeatures]:
+        """Признаки для набора текстов в исходном порядке
+
+        Наборы от BATCH_POOL_THRESHOLD текстов обрабатываются в пуле процессов
+        (по умолчанию по числу ядер), каждый процесс получает копию анализатора
+        один раз; небольшие наборы и max_workers=1 - в текущем процессе
+        """
+        texts = list(texts)
+        workers = pool_size(len(texts), max_workers)
+
+        if workers <= 1:
+            return [self.extract_features(text) for text in texts]
+
+        return list(map_in_pool(
+            self, "extract_features", texts, workers,
+            chunksize=max(1, len(texts) // (workers * 4)),
+        ))
+
+    def _features_from_words(self, text: str, words: List[str],
+                             text_lower: Optional[str] = None) -> DocumentFeatures:
+        """Признаки текста по уже извлеченным словам"""
 
         # Базовые метрики
-        words = self._extract_words(text)
-        sentences = self._extract_sentences(text)
+        sentence_count, sentence_words = self._sentence_stats(text)
         paragraphs = text.split('\n\n')
 
         # Структурные элементы
-        headings = re.findall(r'^#+\s+.+$', text, re.MULTILINE)
-        lists = re.findall(r'^\s*[-*+]\s+.+$', text, re.MULTILINE)
-        tables = re.findall(r'\|.*\|', text)
+        headings = _HEADING_RE.findall(text)
+        lists = _LIST_ITEM_RE.findall(text)
+        tables = _TABLE_ROW_RE.findall(text)
 
         # Вычисляемые метрики
         word_count = len(words)
-        sentence_count = len(sentences)
         paragraph_count = len([p for p in paragraphs if p.strip()])
 
         avg_sentence_length = (
-            sum(len(s.split()) for s in sentences) / sentence_count
+            sentence_words / sentence_count
             if sentence_count > 0 else 0
         )
 
@@ -66,7 +189,7 @@ class NLPAnalyzer:
             len(headings), len(lists), len(tables), paragraph_count
         )
 
-        formality_score = self._calculate_formality_score(text, words)
+        formality_score = self._calculate_formality_score(text, words, text_lower)
 
         return DocumentFeatures(
             word_count=word_count,
@@ -82,22 +205,49 @@ class NLPAnalyzer:
         )
 
     def _extract_words(self, text: str) -> List[str]:
-        """Извлечение слов из текста"""
+        """Извлечение слов из текста
+
+        Результат для последнего текста кэшируется; возвращаемый список
+        не должен изменяться
+        """
+        cached = self._words_cache
+        if cached is not None and cached[0] is text:
+            return cached[1]
+
         # Удаляем markdown разметку и специальные символы
-        clean_text = re.sub(r'[#*_`\[\](){}]', ' ', text)
-        clean_text = re.sub(r'https?://\S+', ' ', clean_text)
+        clean_text = _MARKUP_CHARS_RE.sub(' ', text)
+        if '://' in clean_text:  # ссылки есть не в каждом документе
+            clean_text = _URL_RE.sub(' ', clean_text)
 
         # Извлекаем слова (только кириллица и латиница)
-        words = re.findall(r'\b[а-яёa-z]+\b', clean_text.lower())
+        words = _WORD_RE.findall(clean_text.lower())
 
         # Фильтруем стоп-слова
-        return [word for word in words if word not in self.stop_words and len(word) > 2]
+        words = [word for word in words if word not in self.stop_words and len(word) > 2]
+
+        self._words_cache = (text, words)
+        return words
 
     def _extract_sentences(self, text: str) -> List[str]:
         """Извлечение предложений из текста"""
         # Простое разделение по знакам препинания
-        sentences = re.split(r'[.!?]+', text)
-        return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
+        sentences = _SENTENCE_SPLIT_RE.split(text)
+        return [s for s in map(str.strip, sentences) if len(s) > 10]
+
+    @staticmethod
+    def _sentence_stats(text: str) -> Tuple[int, int]:
+        """Число предложений и слов в них за один проход
+
+        Предложения отбираются так же, как в _extract_sentences, но список
+        не строится
+        """
+        sentence_count = 0
+        word_count = 0
+        for sentence in _SENTENCE_SPLIT_RE.split(text):
+            if len(sentence.strip()) > 10:
+                sentence_count += 1
+                word_count += len(sentence.split())
+        return sentence_count, word_count
 
     def _calculate_structure_complexity(self, headings: int, lists: int,
                                       tables: int, paragraphs: int) -> float:
@@ -110,22 +260,23 @@ class NLPAnalyzer:
         list_ratio = min(lists / paragraphs, 1.0)
         table_ratio = min(tables / paragraphs, 1.0)
 
-        # Взвешенная сумма
-        complexity = (
+        # Взвешенная сумма. Доли ограничены единицей, а веса в сумме дают
+        # ровно 1.0, поэтому результат не превышает 1.0 и без ограничения
+        return (
             heading_ratio * 0.4 +
             list_ratio * 0.3 +
             table_ratio * 0.3
         )
 
-        return min(complexity, 1.0)
-
-    def _calculate_formality_score(self, text: str, words: List[str]) -> float:
+    def _calculate_formality_score(self, text: str, words: List[str],
+                                   text_lower: Optional[str] = None) -> float:
         """Расчет уровня формальности текста"""
         if not words:
             return 0.0
 
         formal_count = 0
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
 
         # Подсчитываем формальные индикаторы
         for indicator in self.formal_indicators:
@@ -135,13 +286,13 @@ class NLPAnalyzer:
         formality_ratio = formal_count / len(words)
 
         # Дополнительные индикаторы формальности
-        if re.search(r'\d+\.\d+\.\d+', text):  # Нумерация разделов
+        if _SECTION_NUMBER_RE.search(text):  # Нумерация разделов
             formality_ratio += 0.1
 
-        if re.search(r'статья|пункт|подпункт|раздел|глава', text_lower):
+        if _LEGAL_TERMS_RE.search(text_lower):
             formality_ratio += 0.1
 
-        if re.search(r'должностная инструкция|положение|регламент|приказ', text_lower):
+        if _FORMAL_DOCUMENT_RE.search(text_lower):
             formality_ratio += 0.2
 
         return min(formality_ratio, 1.0)
@@ -151,45 +302,35 @@ class NLPAnalyzer:
         words = self._extract_words(text)
         word_freq = Counter(words)
 
-        # Ищем потенциальные вариации терминов
-        variations = {}
-        for word in word_freq:
-            if len(word) > 4:  # Только длинные слова
-                # Ищем похожие слова (простая эвристика)
-                similar = [w for w in word_freq if w != word and
-                          (word in w or w in word) and abs(len(w) - len(word)) <= 2]
-                if similar:
-                    variations[word] = word_freq[word]
-
-        return variations
+        # Ищем потенциальные вариации терминов (только длинные слова)
+        varied = term_variations(word_freq)
+        return {
+            word: count
+            for word, count in word_freq.items()
+            if len(word) > 4 and word in varied
+        }
 
     def extract_key_phrases(self, text: str, top_n: int = 10) -> List[Tuple[str, int]]:
         """Извлечение ключевых фраз"""
         # Простое извлечение биграмм и триграмм
         words = self._extract_words(text)
 
-        phrases = []
+        # Фразы считаются кортежами слов (сначала биграммы, затем триграммы),
+        # в строки превращаются только попавшие в результат
+        phrase_freq = Counter(zip(words, words[1:]))
+        phrase_freq.update(zip(words, words[1:], words[2:]))
 
-        # Биграммы
-        for i in range(len(words) - 1):
-            phrase = f"{words[i]} {words[i+1]}"
-            phrases.append(phrase)
-
-        # Триграммы
-        for i in range(len(words) - 2):
-            phrase = f"{words[i]} {words[i+1]} {words[i+2]}"
-            phrases.append(phrase)
-
-        # Подсчитываем частоту
-        phrase_freq = Counter(phrases)
-
-        return phrase_freq.most_common(top_n)
+        return [
+            (" ".join(phrase), count)
+            for phrase, count in phrase_freq.most_common(top_n)
+        ]
 
     def detect_document_language(self, text: str) -> str:
         """Определение языка документа"""
         # Простая эвристика на основе алфавита
-        cyrillic_count = len(re.findall(r'[а-яё]', text.lower()))
-        latin_count = len(re.findall(r'[a-z]', text.lower()))
+        text_lower = text.lower()
+        cyrillic_count = sum(map(len, _CYRILLIC_RUN_RE.findall(text_lower)))
+        latin_count = sum(map(len, _LATIN_RUN_RE.findall(text_lower)))
 
         total_letters = cyrillic_count + latin_count
         if total_letters == 0:
@@ -206,6 +347,10 @@ class NLPAnalyzer:
 
     def extract_entities(self, text: str) -> Dict[str, List[str]]:
         """Извлечение именованных сущностей"""
+        return self._entities_from_text(text, text.lower())
+
+    def _entities_from_text(self, text: str, text_lower: str) -> Dict[str, List[str]]:
+        """Именованные сущности по тексту и его копии в нижнем регистре"""
         entities = {
             "dates": [],
             "organizations": [],
@@ -214,59 +359,41 @@ class NLPAnalyzer:
         }
 
         # Даты (простые паттерны)
-        date_patterns = [
-            r'\d{1,2}\.\d{1,2}\.\d{4}',
-            r'\d{1,2}\s+[а-я]+\s+\d{4}',
-            r'\d{4}\s*г\.?'
-        ]
-
-        for pattern in date_patterns:
-            entities["dates"].extend(re.findall(pattern, text, re.IGNORECASE))
+        for pattern in _DATE_PATTERNS:
+            entities["dates"].extend(pattern.findall(text))
 
         # Организации (простые паттерны)
-        org_patterns = [
-            r'[А-Я][а-я]+\s+[А-Я][а-я]+\s+[А-Я][а-я]+',  # Три слова с заглавных
-            r'ООО\s+"[^"]+"',
-            r'ЗАО\s+"[^"]+"',
-            r'ОАО\s+"[^"]+"'
-        ]
-
-        for pattern in org_patterns:
-            entities["organizations"].extend(re.findall(pattern, text))
+        for pattern in _ORGANIZATION_PATTERNS:
+            entities["organizations"].extend(pattern.findall(text))
 
         # Должности
-        position_keywords = [
-            "директор", "менеджер", "специалист", "инженер", "бухгалтер",
-            "секретарь", "администратор", "консультант", "аналитик"
-        ]
-
-        for keyword in position_keywords:
-            pattern = rf'\b[а-я]*\s*{keyword}[а-я]*\b'
-            matches = re.findall(pattern, text.lower())
-            entities["positions"].extend(matches)
+        for pattern in _POSITION_PATTERNS:
+            entities["positions"].extend(pattern.findall(text_lower))
 
         # Числа
-        entities["numbers"] = re.findall(r'\b\d+(?:\.\d+)?\b', text)
+        entities["numbers"] = _NUMBER_RE.findall(text)
 
         return entities
 
-    def analyze_sentiment(self, text: str) -> Dict[str, float]:
-        """Анализ тональности текста"""
-        # Простой анализ на основе словарей
-        positive_words = {
-            "хорошо", "отлично", "успешно", "эффективно", "качественно",
-            "положительно", "улучшение", "развитие", "достижение"
-        }
+    def extract_numbers_iter(self, text: str) -> Iterator[str]:
+        """Числа текста по одному, без построения списка
 
-        negative_words = {
-            "плохо", "неудовлетворительно", "проблема", "ошибка", "недостаток",
-            "нарушение", "отрицательно", "ухудшение", "снижение"
-        }
+        Находит те же числа, что и extract_entities(text)["numbers"]; подходит
+        для подсчета и однократного просмотра больших документов
+        """
+        return (match.group() for match in _NUMBER_RE.finditer(text))
 
-        words = self._extract_words(text)
+    def analyze_sentiment(self, text: str) -> Dict[str, float]:
+        """Анализ тональности текста"""
+        return self._sentiment_from_words(self._extract_words(text))
 
-        positive_count = sum(1 for word in words if word in positive_words)
-        negative_count = sum(1 for word in words if word in negative_words)
+    def _sentiment_from_words(self, words: List[str]) -> Dict[str, float]:
+        """Тональность по уже извлеченным словам"""
+        # Простой анализ на основе словарей: частоты слов считаются один раз,
+        # дальше проверяются только слова словарей
+        word_freq = Counter(words)
+        positive_count = sum(word_freq[word] for word in _POSITIVE_WORDS)
+        negative_count = sum(word_freq[word] for word in _NEGATIVE_WORDS)
 
         total_sentiment_words = positive_count + negative_count
 
@@ -281,4 +408,4 @@ class NLPAnalyzer:
             "positive": positive_score,
             "negative": negative_score,
             "neutral": max(neutral_score, 0.0)
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,54 @@
+"""
+Пул процессов для пакетной обработки
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Iterator, List, Optional
+
+# Меньшие наборы обрабатываются в текущем процессе: каждый процесс пула
+# заново импортирует пакет и создает свои анализаторы
+BATCH_POOL_THRESHOLD = 16
+
+# Объект, методы которого вызывает рабочий процесс пула (задается в _init_worker)
+_worker_target: Any = None
+
+
+def pool_size(item_count: int, max_workers: Optional[int] = None) -> int:
+    """Число процессов пула для набора из item_count элементов
+
+    1 означает обработку в текущем процессе: набор меньше
+    BATCH_POOL_THRESHOLD или разрешен только один процесс.
+    max_workers по умолчанию - число ядер
+    """
+    if item_count < BATCH_POOL_THRESHOLD:
+        return 1
+    return max(1, min(max_workers or os.cpu_count() or 1, item_count))
+
+
+def map_in_pool(
+    target: Any, method: str, items: List[Any], workers: int, chunksize: int = 1
+) -> Iterator[Any]:
+    """Результаты target.<method>(item) для элементов в исходном порядке
+
+    Вызовы выполняются в пуле из workers процессов; target передается
+    в каждый процесс один раз через инициализатор пула, а не с каждым элементом
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(target,)
+    ) as executor:
+        yield from executor.map(
+            partial(_call_in_worker, method), items, chunksize=chunksize
+        )
+
+
+def _init_worker(target: Any) -> None:
+    """Инициализация рабочего процесса пула"""
+    global _worker_target
+    _worker_target = target
+
+
+def _call_in_worker(method: str, item: Any) -> Any:
+    """Вызов метода объекта рабочего процесса для одного элемента"""
+    return getattr(_worker_target, method)(item)
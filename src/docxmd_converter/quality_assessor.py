@@ -5,14 +5,42 @@
 
 import re
 from collections import Counter
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from .models import DocumentFeatures, QualityAssessment
+from .nlp_analyzer import term_variations
+from .pool_utils import map_in_pool, pool_size
+
+# Символы, не характерные для текста документа (артефакты конвертации)
+_ARTIFACT_CHAR_RE = re.compile(r'[^\w\s\.,!?;:()\[\]{}"\'-]')
+
+# Согласованность
+_NUMBERED_ITEM_RE = re.compile(r"^\s*(\d+)\.", re.MULTILINE)
+_WORD_RE = re.compile(r'\b[а-яёa-z]+\b')
+_HEADING_TEXT_RE = re.compile(r'^#+\s+(.+)$', re.MULTILINE)
+
+# Форматирование
+_UPPERCASE_WORD_RE = re.compile(r'\b[A-Z]{3,}\b')
+_MULTIPLE_SPACES_RE = re.compile(r'  +')
+_EXTRA_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n')
+_MARKDOWN_HEADER_RE = re.compile(r'^#+\s', re.MULTILINE)
+_REPEATED_PUNCTUATION_RE = re.compile(r'[.!?]{2,}')
 
 
 class IntelligentQualityAssessor:
     """Интеллектуальный оценщик качества документов"""
 
+    # Обязательные разделы по типам документов
+    _REQUIRED_SECTIONS = {
+        "должностная_инструкция": (
+            "общие положения", "обязанности", "права", "ответственность"
+        ),
+        "отчет": ("введение", "результаты", "выводы"),
+        "положение": (
+            "общие положения", "основные понятия", "порядок", "заключительные положения"
+        ),
+    }
+
     def __init__(self):
         # Пороговые значения для оценки качества
         self.thresholds = {
@@ -25,23 +53,38 @@ class IntelligentQualityAssessor:
 
     def assess_quality(self, text: str, features: DocumentFeatures,
                       document_type: str = "general",
-                      extracted_data: Dict = None) -> QualityAssessment:
-        """Комплексная оценка качества документа"""
+                      extracted_data: Dict = None,
+                      text_lower: Optional[str] = None) -> QualityAssessment:
+        """Комплексная оценка качества документа
+
+        text_lower - уже построенная копия text в нижнем регистре, если она
+        есть у вызывающего кода
+        """
 
         if extracted_data is None:
             extracted_data = {}
 
+        # Артефакты конвертации нужны в трех проверках - считаем один раз
+        artifacts_count = self._count_artifacts(text)
+        # Нижний регистр нужен в нескольких проверках - приводим текст один раз
+        if text_lower is None:
+            text_lower = text.lower()
+
         # Оценка структуры
         structure_score = self._assess_structure(features)
 
         # Оценка содержания
-        content_score = self._assess_content(text, features, document_type, extracted_data)
+        content_score = self._assess_content(
+            text, features, document_type, extracted_data, artifacts_count
+        )
 
         # Оценка согласованности
-        consistency_score = self._assess_consistency(text, features)
+        consistency_score = self._assess_consistency(text, features, text_lower)
 
         # Оценка полноты
-        completeness_score = self._assess_completeness(text, document_type, extracted_data)
+        completeness_score = self._assess_completeness(
+            text, document_type, extracted_data, text_lower
+        )
 
         # Оценка форматирования
         formatting_score = self._assess_formatting(text, features)
@@ -55,8 +98,12 @@ class IntelligentQualityAssessor:
         )
 
         # Выявление проблем
-        issues = self._identify_issues(text, features, document_type)
-        critical_issues = self._identify_critical_issues(text, features, document_type)
+        issues = self._identify_issues(
+            text, features, document_type, artifacts_count, text_lower
+        )
+        critical_issues = self._identify_critical_issues(
+            text, features, document_type, artifacts_count
+        )
 
         # Рекомендации
         recommendations = self._generate_recommendations(
@@ -76,6 +123,38 @@ class IntelligentQualityAssessor:
             critical_issues=critical_issues
         )
 
+    def assess_quality_batch(
+        self,
+        items: Iterable[Tuple[str, DocumentFeatures, str, Dict]],
+        max_workers: Optional[int] = None,
+    ) -> List[QualityAssessment]:
+        """Оценка качества набора документов в исходном порядке
+
+        Элемент набора - (текст, признаки, тип документа, извлеченные данные).
+        Наборы от BATCH_POOL_THRESHOLD документов оцениваются в пуле процессов
+        (по умолчанию по числу ядер), небольшие и при max_workers=1 - в
+        текущем процессе
+        """
+        items = list(items)
+        workers = pool_size(len(items), max_workers)
+
+        if workers <= 1:
+            return [self.assess_quality(*item) for item in items]
+
+        return list(map_in_pool(
+            self, "_assess_item", items, workers,
+            chunksize=max(1, len(items) // (workers * 4)),
+        ))
+
+    def _assess_item(self, item: Tuple[str, DocumentFeatures, str, Dict]) -> QualityAssessment:
+        """Оценка качества одного элемента набора (в рабочем процессе пула)"""
+        return self.assess_quality(*item)
+
+    @staticmethod
+    def _count_artifacts(text: str) -> int:
+        """Количество символов-артефактов конвертации"""
+        return sum(1 for _ in _ARTIFACT_CHAR_RE.finditer(text))
+
     def _assess_structure(self, features: DocumentFeatures) -> float:
         """Оценка структуры документа"""
         score = 1.0
@@ -101,7 +180,8 @@ class IntelligentQualityAssessor:
         return max(score, 0.0)
 
     def _assess_content(self, text: str, features: DocumentFeatures,
-                       document_type: str, extracted_data: Dict) -> float:
+                       document_type: str, extracted_data: Dict,
+                       artifacts_count: Optional[int] = None) -> float:
         """Оценка содержания документа"""
         score = 1.0
 
@@ -123,42 +203,42 @@ class IntelligentQualityAssessor:
             score -= 0.2
 
         # Проверка на артефакты конвертации
-        artifacts = re.findall(r'[^\w\s\.,!?;:()\[\]{}"\'-]', text)
-        if len(artifacts) > features.word_count * 0.05:  # Более 5% артефактов
+        if artifacts_count is None:
+            artifacts_count = self._count_artifacts(text)
+        if artifacts_count > features.word_count * 0.05:  # Более 5% артефактов
             score -= 0.3
 
         return max(score, 0.0)
 
-    def _assess_consistency(self, text: str, features: DocumentFeatures) -> float:
+    def _assess_consistency(self, text: str, features: DocumentFeatures,
+                            text_lower: Optional[str] = None) -> float:
         """Оценка согласованности документа"""
         score = 1.0
 
         # Проверка согласованности нумерации
-        numbered_items = re.findall(r"^\s*(\d+)\.", text, re.MULTILINE)
-        if numbered_items:
-            numbers = [int(n) for n in numbered_items]
-            expected = list(range(1, len(numbers) + 1))
-            if numbers != expected:
-                score -= 0.3
+        # (номера должны идти подряд с 1; проверка прерывается на первом сбое)
+        if not all(
+            int(match.group(1)) == expected
+            for expected, match in enumerate(_NUMBERED_ITEM_RE.finditer(text), 1)
+        ):
+            score -= 0.3
 
         # Проверка согласованности терминологии
-        words = re.findall(r'\b[а-яёa-z]+\b', text.lower())
+        if text_lower is None:
+            text_lower = text.lower()
+        words = _WORD_RE.findall(text_lower)
         word_freq = Counter(words)
 
         # Ищем потенциальные вариации терминов
-        variations = 0
-        for word in word_freq:
-            if len(word) > 4:
-                similar = [w for w in word_freq if w != word and
-                          (word in w or w in word) and abs(len(w) - len(word)) <= 2]
-                if similar:
-                    variations += 1
-
-        if variations > len(set(words)) * 0.1:  # Более 10% вариаций
+        varied = term_variations(word_freq)
+        variations = sum(1 for word in varied if len(word) > 4)
+
+        if variations > len(word_freq) * 0.1:  # Более 10% вариаций
             score -= 0.2
 
         # Проверка согласованности стиля заголовков
-        headings = re.findall(r'^#+\s+(.+)$', text, re.MULTILINE)
+        # (без символа "#" заголовков в тексте быть не может)
+        headings = _HEADING_TEXT_RE.findall(text) if "#" in text else ()
         if headings:
             # Проверяем единообразие заглавных букв
             title_case_count = sum(1 for h in headings if h[0].isupper())
@@ -168,35 +248,19 @@ class IntelligentQualityAssessor:
         return max(score, 0.0)
 
     def _assess_completeness(self, text: str, document_type: str,
-                           extracted_data: Dict) -> float:
+                           extracted_data: Dict,
+                           text_lower: Optional[str] = None) -> float:
         """Оценка полноты документа"""
         score = 1.0
 
-        if document_type == "должностная_инструкция":
-            required_sections = [
-                "общие положения", "обязанности", "права", "ответственность"
-            ]
-            found_sections = sum(
-                1 for section in required_sections if section in text.lower()
-            )
-            score = found_sections / len(required_sections)
-
-        elif document_type == "отчет":
-            required_sections = ["введение", "результаты", "выводы"]
+        required_sections = self._REQUIRED_SECTIONS.get(document_type)
+        if required_sections:
+            if text_lower is None:
+                text_lower = text.lower()
             found_sections = sum(
-                1 for section in required_sections if section in text.lower()
+                1 for section in required_sections if section in text_lower
             )
             score = found_sections / len(required_sections)
-
-        elif document_type == "положение":
-            required_sections = [
-                "общие положения", "основные понятия", "порядок", "заключительные положения"
-            ]
-            found_sections = sum(
-                1 for section in required_sections if section in text.lower()
-            )
-            score = found_sections / len(required_sections)
-
         else:
             # Для других типов документов - базовая оценка
             if len(extracted_data) > 5:
@@ -211,7 +275,9 @@ class IntelligentQualityAssessor:
         return max(score, 0.0)
 
     def _identify_issues(self, text: str, features: DocumentFeatures,
-                        document_type: str) -> List[str]:
+                        document_type: str,
+                        artifacts_count: Optional[int] = None,
+                        text_lower: Optional[str] = None) -> List[str]:
         """Выявление проблем в документе"""
         issues = []
 
@@ -233,15 +299,18 @@ class IntelligentQualityAssessor:
             issues.append("Низкое разнообразие словаря")
 
         # Проблемы конвертации
-        artifacts_count = len(re.findall(r'[^\w\s\.,!?;:()\[\]{}"\'-]', text))
+        if artifacts_count is None:
+            artifacts_count = self._count_artifacts(text)
         if artifacts_count > features.word_count * 0.05:
             issues.append(f"Множественные артефакты конвертации ({artifacts_count})")
 
         # Проблемы формата
-        if "требует заполнения" in text.lower():
+        if text_lower is None:
+            text_lower = text.lower()
+        if "требует заполнения" in text_lower:
             issues.append("Документ содержит незаполненные разделы")
 
-        if re.search(r'\b[A-Z]{3,}\b', text):
+        if _UPPERCASE_WORD_RE.search(text):
             issues.append("Обнаружены слова в верхнем регистре (возможно, ошибки форматирования)")
 
         return issues
@@ -284,20 +353,20 @@ class IntelligentQualityAssessor:
         formatting_issues = 0
 
         # Множественные пробелы
-        if re.search(r'  +', text):
+        if _MULTIPLE_SPACES_RE.search(text):
             formatting_issues += 1
 
         # Неправильные переносы строк
-        if re.search(r'\n\s*\n\s*\n', text):
+        if _EXTRA_BLANK_LINES_RE.search(text):
             formatting_issues += 1
 
         # Смешанные стили заголовков
-        markdown_headers = len(re.findall(r'^#+\s', text, re.MULTILINE))
+        markdown_headers = len(_MARKDOWN_HEADER_RE.findall(text))
         if markdown_headers > 0 and markdown_headers != features.heading_count:
             formatting_issues += 1
 
         # Неправильная пунктуация
-        if re.search(r'[.!?]{2,}', text):
+        if _REPEATED_PUNCTUATION_RE.search(text):
             formatting_issues += 1
 
         # Снижаем оценку за каждую проблему
@@ -306,7 +375,8 @@ class IntelligentQualityAssessor:
         return max(score, 0.0)
 
     def _identify_critical_issues(self, text: str, features: DocumentFeatures,
-                                 document_type: str) -> List[str]:
+                                 document_type: str,
+                                 artifacts_count: Optional[int] = None) -> List[str]:
         """Выявление критических проблем"""
         critical_issues = []
 
@@ -319,7 +389,8 @@ class IntelligentQualityAssessor:
             critical_issues.append("Полное отсутствие структуры документа")
 
         # Множественные артефакты
-        artifacts_count = len(re.findall(r'[^\w\s\.,!?;:()\[\]{}"\'-]', text))
+        if artifacts_count is None:
+            artifacts_count = self._count_artifacts(text)
         if artifacts_count > features.word_count * 0.1:
             critical_issues.append("Критическое количество артефактов конвертации")
 
@@ -327,4 +398,4 @@ class IntelligentQualityAssessor:
         if features.vocabulary_richness < 0.1:
             critical_issues.append("Крайне низкое качество текста")
 
-        return critical_issues
\ No newline at end of file
+        return critical_issues
@@ -4,23 +4,222 @@
 Базовая версия без Flask для демонстрации
 """
 
+import gzip
+import hashlib
 import json
 import webbrowser
-from pathlib import Path
+from dataclasses import dataclass
 from datetime import datetime
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import threading
 import time
 
+# Стили страницы: отдаются отдельным файлом, имя которого содержит хэш
+# содержимого, поэтому браузер может кэшировать его бессрочно
+_PAGE_CSS = """\
+body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    margin: 0;
+    padding: 20px;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    min-height: 100vh;
+}
+.container {
+    max-width: 800px;
+    margin: 0 auto;
+    background: white;
+    border-radius: 15px;
+    padding: 30px;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+}
+.header {
+    text-align: center;
+    margin-bottom: 30px;
+}
+.header h1 {
+    color: #333;
+    margin: 0;
+    font-size: 2.5em;
+}
+.header p {
+    color: #666;
+    margin: 10px 0;
+}
+.feature-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+    gap: 20px;
+    margin: 30px 0;
+}
+.feature-card {
+    background: #f8f9fa;
+    border-radius: 10px;
+    padding: 20px;
+    text-align: center;
+    border: 2px solid #e9ecef;
+    transition: transform 0.3s ease;
+}
+.feature-card:hover {
+    transform: translateY(-5px);
+    border-color: #667eea;
+}
+.feature-icon {
+    font-size: 3em;
+    margin-bottom: 15px;
+}
+.feature-title {
+    font-size: 1.2em;
+    font-weight: bold;
+    margin-bottom: 10px;
+    color: #333;
+}
+.feature-desc {
+    color: #666;
+    font-size: 0.9em;
+}
+.status-section {
+    background: #e8f5e8;
+    border-radius: 10px;
+    padding: 20px;
+    margin: 20px 0;
+    border-left: 5px solid #28a745;
+}
+.stats-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
+    gap: 15px;
+    margin: 20px 0;
+}
+.stat-item {
+    text-align: center;
+    background: white;
+    padding: 15px;
+    border-radius: 8px;
+}
+.stat-number {
+    font-size: 2em;
+    font-weight: bold;
+    color: #667eea;
+}
+.stat-label {
+    color: #666;
+    font-size: 0.9em;
+}
+.info-section {
+    background: #fff3cd;
+    border-radius: 10px;
+    padding: 20px;
+    margin: 20px 0;
+    border-left: 5px solid #ffc107;
+}
+"""
+
+
+@dataclass(slots=True)
+class _Asset:
+    """Ресурс, который сервер отдает из памяти
+
+    Заголовки ответа 200 (кроме строки статуса, Server и Date) собраны
+    заранее для обоих вариантов тела: несжатого и gzip
+    """
+
+    etag: str
+    cache_control: str
+    body: bytes
+    headers: bytes
+    body_gzip: bytes
+    headers_gzip: bytes
+
+    @classmethod
+    def build(cls, text: str, content_type: str, cache_control: str) -> "_Asset":
+        """Кодирование, сжатие и заголовки ресурса (один раз при запуске)"""
+        body = text.encode("utf-8")
+        body_gzip = gzip.compress(body, compresslevel=9)
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+
+        def headers(payload, encoding_header):
+            return (
+                f"Content-Type: {content_type}\r\n"
+                f"{encoding_header}"
+                "Vary: Accept-Encoding\r\n"
+                f"ETag: {etag}\r\n"
+                f"Cache-Control: {cache_control}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "\r\n"
+            ).encode("latin-1")
+
+        return cls(
+            etag, cache_control,
+            body, headers(body, ""),
+            body_gzip, headers(body_gzip, "Content-Encoding: gzip\r\n"),
+        )
+
+
+class _PageRequestHandler(BaseHTTPRequestHandler):
+    """Отдача страницы веб-интерфейса и ее стилей из памяти"""
+
+    def do_GET(self):
+        self._send_asset(with_body=True)
+
+    def do_HEAD(self):
+        self._send_asset(with_body=False)
+
+    def _send_asset(self, with_body):
+        """Ответ с ресурсом (или 304, если он уже есть у браузера)"""
+        asset = self.server.web_interface.assets.get(self.path.split("?", 1)[0])
+        if asset is None:
+            self.send_error(404)
+            return
+
+        # Повторная загрузка не нужна, пока ETag совпадает (страница
+        # перепроверяется при каждом открытии, стили кэшируются бессрочно)
+        if self.headers.get("If-None-Match") == asset.etag:
+            self.send_response(304)
+            self.send_header("ETag", asset.etag)
+            self.send_header("Cache-Control", asset.cache_control)
+            self.end_headers()
+            return
+
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            headers, body = asset.headers_gzip, asset.body_gzip
+        else:
+            headers, body = asset.headers, asset.body
+
+        # Весь ответ уходит одной записью в сокет: меняются только
+        # строка статуса и дата, остальные заголовки готовы заранее
+        self.log_request(200)
+        status = (
+            f"{self.protocol_version} 200 OK\r\n"
+            f"Server: {self.version_string()}\r\n"
+            f"Date: {self.date_time_string()}\r\n"
+        ).encode("latin-1")
+        self.wfile.write(b"".join((status, headers, body if with_body else b"")))
+
+
 class WebInterface:
     """Простой веб-интерфейс"""
 
+    # Адреса, по которым доступна страница
+    PAGE_PATHS = ("/", "/index.html", "/web_interface.html")
+
     def __init__(self, port=8000):
         self.port = port
         self.server = None
         self.server_thread = None
 
+        # Ресурсы строятся и сжимаются один раз и отдаются из памяти
+        stylesheet = _Asset.build(
+            _PAGE_CSS, "text/css; charset=utf-8", "public, max-age=31536000, immutable"
+        )
+        css_hash = hashlib.sha1(stylesheet.body).hexdigest()[:8]
+        self.stylesheet_path = f"/static/app.{css_hash}.css"
+        page = _Asset.build(
+            self.create_html_page(), "text/html; charset=utf-8", "no-cache"
+        )
+
+        self.assets = {path: page for path in self.PAGE_PATHS}
+        self.assets[self.stylesheet_path] = stylesheet
+
     def create_html_page(self):
         """Создание HTML страницы"""
         html_content = """
@@ -30,103 +229,7 @@ class WebInterface:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>DocxMD Converter - Веб-интерфейс</title>
-    <style>
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }
-        .container {
-            max-width: 800px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            padding: 30px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        }
-        .header {
-            text-align: center;
-            margin-bottom: 30px;
-        }
-        .header h1 {
-            color: #333;
-            margin: 0;
-            font-size: 2.5em;
-        }
-        .header p {
-            color: #666;
-            margin: 10px 0;
-        }
-        .feature-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin: 30px 0;
-        }
-        .feature-card {
-            background: #f8f9fa;
-            border-radius: 10px;
-            padding: 20px;
-            text-align: center;
-            border: 2px solid #e9ecef;
-            transition: transform 0.3s ease;
-        }
-        .feature-card:hover {
-            transform: translateY(-5px);
-            border-color: #667eea;
-        }
-        .feature-icon {
-            font-size: 3em;
-            margin-bottom: 15px;
-        }
-        .feature-title {
-            font-size: 1.2em;
-            font-weight: bold;
-            margin-bottom: 10px;
-            color: #333;
-        }
-        .feature-desc {
-            color: #666;
-            font-size: 0.9em;
-        }
-        .status-section {
-            background: #e8f5e8;
-            border-radius: 10px;
-            padding: 20px;
-            margin: 20px 0;
-            border-left: 5px solid #28a745;
-        }
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 15px;
-            margin: 20px 0;
-        }
-        .stat-item {
-            text-align: center;
-            background: white;
-            padding: 15px;
-            border-radius: 8px;
-        }
-        .stat-number {
-            font-size: 2em;
-            font-weight: bold;
-            color: #667eea;
-        }
-        .stat-label {
-            color: #666;
-            font-size: 0.9em;
-        }
-        .info-section {
-            background: #fff3cd;
-            border-radius: 10px;
-            padding: 20px;
-            margin: 20px 0;
-            border-left: 5px solid #ffc107;
-        }
-    </style>
+    <link rel="stylesheet" href="__STYLESHEET_PATH__">
 </head>
 <body>
     <div class="container">
@@ -260,29 +363,23 @@ python3 run_system.py</pre>
 </body>
 </html>"""
 
-        # Сохраняем HTML файл
-        html_file = Path("web_interface.html")
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-
-        return html_file
+        return html_content.replace("__STYLESHEET_PATH__", self.stylesheet_path)
 
     def start_server(self):
         """Запуск веб-сервера"""
         try:
-            # Создаем HTML страницу
-            html_file = self.create_html_page()
-
-            # Запускаем простой HTTP сервер
-            handler = SimpleHTTPRequestHandler
+            # Запускаем HTTP сервер: каждый запрос обслуживается в своем
+            # потоке (daemon-потоки не задерживают остановку), адрес
+            # переиспользуется при быстром перезапуске
+            with ThreadingHTTPServer(("", self.port), _PageRequestHandler) as httpd:
+                httpd.web_interface = self
 
-            with socketserver.TCPServer(("", self.port), handler) as httpd:
                 print(f"🌐 Веб-сервер запущен на http://localhost:{self.port}")
-                print(f"📄 Страница: http://localhost:{self.port}/web_interface.html")
+                print(f"📄 Страница: http://localhost:{self.port}/")
                 print("🛑 Нажмите Ctrl+C для остановки")
 
                 # Открываем браузер
-                webbrowser.open(f"http://localhost:{self.port}/web_interface.html")
+                webbrowser.open(f"http://localhost:{self.port}/")
 
                 # Запускаем сервер
                 httpd.serve_forever()
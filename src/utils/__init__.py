@@ -2,11 +2,31 @@
 Утилиты для обработки документов
 """
 
-from .content_analyzers import ContentProcessor, SmartContentExtractor
-from .reporting import ReportGenerator
+import importlib
+
+# Классы загружаются при первом обращении (PEP 562): импорт одного модуля
+# пакета не тянет за собой остальные
+_LAZY_IMPORTS = {
+    'ContentProcessor': '.content_analyzers',
+    'SmartContentExtractor': '.content_analyzers',
+    'ReportGenerator': '.reporting',
+}
 
 __all__ = [
     'ContentProcessor',
     'SmartContentExtractor',
     'ReportGenerator',
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
@@ -3,13 +3,15 @@
 Модуль анализаторов контента для различных типов документов
 """
 
+import hashlib
 import re
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class ContentElement:
     """Элемент контента"""
 
@@ -36,25 +38,45 @@ class ContentAnalyzer(ABC):
 class TableAnalyzer(ContentAnalyzer):
     """Анализатор таблиц"""
 
+    # Поиск таблиц в различных форматах: (символ, без которого таблицы
+    # этого формата быть не может, шаблон)
+    _TABLE_PATTERNS = (
+        # Markdown таблицы
+        (
+            "|",
+            re.compile(
+                r"(\|[^\n]*\|[\n\r]*\|[-\s\|]*\|[\n\r]*(?:\|[^\n]*\|[\n\r]*)*)",
+                re.MULTILINE | re.DOTALL | re.IGNORECASE,
+            ),
+        ),
+        # HTML таблицы
+        (
+            "<",
+            re.compile(
+                r"(<table[^>]*>.*?</table>)", re.MULTILINE | re.DOTALL | re.IGNORECASE
+            ),
+        ),
+        # Псевдо-таблицы с табуляцией
+        (
+            "\t",
+            re.compile(
+                r"((?:^[^\n]*\t[^\n]*$[\n\r]*){2,})",
+                re.MULTILINE | re.DOTALL | re.IGNORECASE,
+            ),
+        ),
+    )
+    _BROKEN_ROW_RE = re.compile(r"\|[\s\-\|]*\|\s*$", re.MULTILINE)
+    _EMPTY_ROW_RE = re.compile(r"^\s*\|\s*$", re.MULTILINE)
+    _SIMPLE_TABLE_RE = re.compile(r"^\|([^|]+)\|([^|]+)\|$", re.MULTILINE)
+
     def analyze(self, content: str) -> List[ContentElement]:
         """Анализ таблиц в контенте"""
         elements = []
 
-        # Поиск таблиц в различных форматах
-        table_patterns = [
-            # Markdown таблицы
-            r"(\|[^\n]*\|[\n\r]*\|[-\s\|]*\|[\n\r]*(?:\|[^\n]*\|[\n\r]*)*)",
-            # HTML таблицы
-            r"(<table[^>]*>.*?</table>)",
-            # Псевдо-таблицы с табуляцией
-            r"((?:^[^\n]*\t[^\n]*$[\n\r]*){2,})",
-        ]
-
-        for i, pattern in enumerate(table_patterns):
-            matches = re.finditer(
-                pattern, content, re.MULTILINE | re.DOTALL | re.IGNORECASE
-            )
-            for match in matches:
+        for i, (marker, pattern) in enumerate(self._TABLE_PATTERNS):
+            if marker not in content:  # документ без таблиц этого формата
+                continue
+            for match in pattern.finditer(content):
                 table_content = match.group(1)
                 elements.append(
                     ContentElement(
@@ -72,33 +94,43 @@ class TableAnalyzer(ContentAnalyzer):
 
     def clean(self, content: str) -> str:
         """Очистка таблиц"""
-        # Удаление поврежденных таблиц
-        content = re.sub(r"\|[\s\-\|]*\|\s*$", "", content, flags=re.MULTILINE)
-        content = re.sub(r"^\s*\|\s*$", "", content, flags=re.MULTILINE)
+        if "|" not in content:  # все шаблоны очистки требуют символа таблицы
+            return content
 
-        # Преобразование простых таблиц в списки
-        simple_table_pattern = r"^\|([^|]+)\|([^|]+)\|$"
-        matches = re.findall(simple_table_pattern, content, re.MULTILINE)
+        # Удаление поврежденных таблиц
+        content = self._BROKEN_ROW_RE.sub("", content)
+        content = self._EMPTY_ROW_RE.sub("", content)
 
-        for col1, col2 in matches:
-            if col1.strip() and col2.strip():
-                replacement = f"**{col1.strip()}:** {col2.strip()}"
-                original = f"|{col1}|{col2}|"
-                content = content.replace(original, replacement)
+        # Преобразование простых таблиц в списки (за один проход)
+        return self._SIMPLE_TABLE_RE.sub(self._simple_row_to_item, content)
 
-        return content
+    @staticmethod
+    def _simple_row_to_item(match: re.Match) -> str:
+        """Строка простой таблицы из двух колонок -> элемент "**ключ:** значение" """
+        col1, col2 = match.group(1).strip(), match.group(2).strip()
+        if col1 and col2:
+            return f"**{col1}:** {col2}"
+        return match.group(0)
 
 
 class ListAnalyzer(ContentAnalyzer):
     """Анализатор списков"""
 
+    _NUMBERED_RE = re.compile(r"^(\s*)(\d+\.)\s*(.+)$", re.MULTILINE)
+    _BULLET_RE = re.compile(r"^(\s*)([-*•▪▫])\s*(.+)$", re.MULTILINE)
+    _WRONG_MARKER_RE = re.compile(r"^(\s*)[•▪▫]\s*", re.MULTILINE)
+    _EMPTY_ITEM_RE = re.compile(r"^(\s*)[-*]\s*$", re.MULTILINE)
+    # Строка нумерованного списка: отступ и текст после номера
+    # (пробельные символы не захватывают переводы строк)
+    _NUMBERED_ITEM_RE = re.compile(r"^([^\S\n]*)\d+\.([^\S\n].*)$", re.MULTILINE)
+    _NON_BLANK_RE = re.compile(r"\S")
+
     def analyze(self, content: str) -> List[ContentElement]:
         """Анализ списков"""
         elements = []
 
         # Нумерованные списки
-        numbered_pattern = r"^(\s*)(\d+\.)\s*(.+)$"
-        numbered_matches = re.finditer(numbered_pattern, content, re.MULTILINE)
+        numbered_matches = self._NUMBERED_RE.finditer(content)
 
         for match in numbered_matches:
             indent, number, text = match.groups()
@@ -113,8 +145,7 @@ class ListAnalyzer(ContentAnalyzer):
             )
 
         # Маркированные списки
-        bullet_pattern = r"^(\s*)([-*•▪▫])\s*(.+)$"
-        bullet_matches = re.finditer(bullet_pattern, content, re.MULTILINE)
+        bullet_matches = self._BULLET_RE.finditer(content)
 
         for match in bullet_matches:
             indent, bullet, text = match.groups()
@@ -133,48 +164,45 @@ class ListAnalyzer(ContentAnalyzer):
     def clean(self, content: str) -> str:
         """Очистка списков"""
         # Исправление неправильных маркеров
-        content = re.sub(r"^(\s*)[•▪▫]\s*", r"\1- ", content, flags=re.MULTILINE)
+        if "•" in content or "▪" in content or "▫" in content:
+            content = self._WRONG_MARKER_RE.sub(r"\1- ", content)
 
         # Удаление пустых элементов списка
-        content = re.sub(r"^(\s*)[-*]\s*$", "", content, flags=re.MULTILINE)
+        if "-" in content or "*" in content:
+            content = self._EMPTY_ITEM_RE.sub("", content)
 
-        # Исправление нумерации
-        lines = content.split("\n")
-        in_numbered_list = False
-        current_number = 1
-
-        for i, line in enumerate(lines):
-            if re.match(r"^\s*\d+\.\s", line):
-                if not in_numbered_list:
-                    in_numbered_list = True
-                    current_number = 1
-
-                # Исправляем нумерацию
-                indent_match = re.match(r"^(\s*)\d+\.(\s*.+)$", line)
-                if indent_match:
-                    indent, rest = indent_match.groups()
-                    lines[i] = f"{indent}{current_number}.{rest}"
-                    current_number += 1
-            else:
-                if in_numbered_list and not line.strip():
-                    continue
-                else:
-                    in_numbered_list = False
-                    current_number = 1
+        # Исправление нумерации: в каждом списке номера идут подряд с 1.
+        # Пустые строки список не прерывают, любая другая строка - прерывает
+        number = 0
+        previous_end = 0
+
+        def renumber(match: re.Match) -> str:
+            nonlocal number, previous_end
+            if self._NON_BLANK_RE.search(content, previous_end, match.start()):
+                number = 0
+            number += 1
+            previous_end = match.end()
+            return f"{match.group(1)}{number}.{match.group(2)}"
 
-        return "\n".join(lines)
+        return self._NUMBERED_ITEM_RE.sub(renumber, content)
 
 
 class HeadingAnalyzer(ContentAnalyzer):
     """Анализатор заголовков"""
 
+    _HEADING_RE = re.compile(r"^(#{1,6})\s*(.+)$", re.MULTILINE)
+    _UNDERLINE_RE = re.compile(r"^(.+)\n(=+|-+)$", re.MULTILINE)
+    _MISSING_SPACE_RE = re.compile(r"^(#{1,6})([^\s#])", re.MULTILINE)
+    _TRAILING_HASHES_RE = re.compile(r"^(#{1,6}\s*)(.+?)\s*#+\s*$", re.MULTILINE)
+    _UNDERLINE_H1_RE = re.compile(r"^(.+)\n(=+)$", re.MULTILINE)
+    _UNDERLINE_H2_RE = re.compile(r"^(.+)\n(-+)$", re.MULTILINE)
+
     def analyze(self, content: str) -> List[ContentElement]:
         """Анализ заголовков"""
         elements = []
 
         # Markdown заголовки
-        heading_pattern = r"^(#{1,6})\s*(.+)$"
-        matches = re.finditer(heading_pattern, content, re.MULTILINE)
+        matches = self._HEADING_RE.finditer(content)
 
         for match in matches:
             hashes, title = match.groups()
@@ -189,8 +217,7 @@ class HeadingAnalyzer(ContentAnalyzer):
             )
 
         # Заголовки с подчеркиванием
-        underline_pattern = r"^(.+)\n(=+|-+)$"
-        underline_matches = re.finditer(underline_pattern, content, re.MULTILINE)
+        underline_matches = self._UNDERLINE_RE.finditer(content)
 
         for match in underline_matches:
             title, underline = match.groups()
@@ -208,20 +235,19 @@ class HeadingAnalyzer(ContentAnalyzer):
 
     def clean(self, content: str) -> str:
         """Очистка заголовков"""
-        # Исправление пробелов в заголовках
-        content = re.sub(r"^(#{1,6})([^\s#])", r"\1 \2", content, flags=re.MULTILINE)
+        # Проходы, которым нечего менять в документе, пропускаются
+        if "#" in content:
+            # Исправление пробелов в заголовках
+            content = self._MISSING_SPACE_RE.sub(r"\1 \2", content)
 
-        # Удаление лишних символов в заголовках
-        content = re.sub(
-            r"^(#{1,6}\s*)(.+?)\s*#+\s*$", r"\1\2", content, flags=re.MULTILINE
-        )
+            # Удаление лишних символов в заголовках
+            content = self._TRAILING_HASHES_RE.sub(r"\1\2", content)
 
         # Преобразование заголовков с подчеркиванием в Markdown
-        underline_pattern = r"^(.+)\n(=+)$"
-        content = re.sub(underline_pattern, r"# \1", content, flags=re.MULTILINE)
-
-        underline_pattern2 = r"^(.+)\n(-+)$"
-        content = re.sub(underline_pattern2, r"## \1", content, flags=re.MULTILINE)
+        if "\n=" in content:
+            content = self._UNDERLINE_H1_RE.sub(r"# \1", content)
+        if "\n-" in content:
+            content = self._UNDERLINE_H2_RE.sub(r"## \1", content)
 
         return content
 
@@ -229,12 +255,28 @@ class HeadingAnalyzer(ContentAnalyzer):
 class ParagraphAnalyzer(ContentAnalyzer):
     """Анализатор параграфов"""
 
+    _PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+    _SENTENCE_ENDINGS = (".", "!", "?", ":", ";")
+    _IMPORTANT_KEYWORDS = (
+        "важно",
+        "внимание",
+        "примечание",
+        "осторожно",
+        "предупреждение",
+    )
+    _BLOCK_START_RE = re.compile(r"^(#{1,6}|\s*[-*•]\s*|\s*\d+\.\s*)")
+    _MULTI_SPACE_RE = re.compile(r" {2,}")
+    _CODE_LANGUAGE_RE = re.compile(r"^```(\w+)")
+    _QUOTE_TABLE = str.maketrans(
+        {"\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'"}
+    )
+
     def analyze(self, content: str) -> List[ContentElement]:
         """Анализ параграфов"""
         elements = []
 
         # Разделяем контент на параграфы
-        paragraphs = re.split(r"\n\s*\n", content)
+        paragraphs = self._PARAGRAPH_SPLIT_RE.split(content)
 
         for para in paragraphs:
             para = para.strip()
@@ -248,25 +290,19 @@ class ParagraphAnalyzer(ContentAnalyzer):
             # Цитаты
             if para.startswith(">"):
                 para_type = "quote"
-                metadata["quote_level"] = str(len(re.match(r"^>+", para).group()))
+                metadata["quote_level"] = str(len(para) - len(para.lstrip(">")))
 
             # Код
             elif para.startswith("```") or para.startswith("    "):
                 para_type = "code"
                 if para.startswith("```"):
-                    lang_match = re.match(r"^```(\w+)", para)
+                    lang_match = self._CODE_LANGUAGE_RE.match(para)
                     if lang_match:
                         metadata["language"] = lang_match.group(1)
 
             # Определяем важность по ключевым словам
-            important_keywords = [
-                "важно",
-                "внимание",
-                "примечание",
-                "осторожно",
-                "предупреждение",
-            ]
-            if any(keyword in para.lower() for keyword in important_keywords):
+            para_lower = para.lower()
+            if any(keyword in para_lower for keyword in self._IMPORTANT_KEYWORDS):
                 metadata["importance"] = "high"
 
             elements.append(
@@ -279,11 +315,13 @@ class ParagraphAnalyzer(ContentAnalyzer):
         """Очистка параграфов"""
         # Исправление разорванных предложений
         lines = content.split("\n")
+        stripped = [line.strip() for line in lines]  # каждая строка - один раз
+        line_count = len(lines)
         cleaned_lines = []
         i = 0
 
-        while i < len(lines):
-            line = lines[i].strip()
+        while i < line_count:
+            line = stripped[i]
 
             if not line:
                 cleaned_lines.append("")
@@ -292,20 +330,15 @@ class ParagraphAnalyzer(ContentAnalyzer):
 
             # Если строка не заканчивается знаком препинания и следующая строка не является заголовком/списком
             if (
-                i + 1 < len(lines)
-                and not re.search(r"[.!?:;]$", line)
-                and lines[i + 1].strip()
-                and not re.match(r"^(#{1,6}|\s*[-*•]\s*|\s*\d+\.\s*)", lines[i + 1])
+                i + 1 < line_count
+                and not line.endswith(self._SENTENCE_ENDINGS)
+                and stripped[i + 1]
+                and not stripped[i + 1][0].isupper()
+                and not self._BLOCK_START_RE.match(lines[i + 1])
             ):
-
                 # Объединяем строки
-                next_line = lines[i + 1].strip()
-                if next_line and not next_line[0].isupper():
-                    line += " " + next_line
-                    i += 2
-                else:
-                    cleaned_lines.append(line)
-                    i += 1
+                cleaned_lines.append(line + " " + stripped[i + 1])
+                i += 2
             else:
                 cleaned_lines.append(line)
                 i += 1
@@ -313,11 +346,11 @@ class ParagraphAnalyzer(ContentAnalyzer):
         content = "\n".join(cleaned_lines)
 
         # Удаление лишних пробелов
-        content = re.sub(r" {2,}", " ", content)
+        if "  " in content:
+            content = self._MULTI_SPACE_RE.sub(" ", content)
 
-        # Исправление кавычек
-        content = re.sub(r'[""]', '"', content)
-        content = content.replace(""", "'").replace(""", "'")
+        # Исправление кавычек (типографские -> прямые, за один проход)
+        content = content.translate(self._QUOTE_TABLE)
 
         return content
 
@@ -325,6 +358,9 @@ class ParagraphAnalyzer(ContentAnalyzer):
 class ContentProcessor:
     """Основной процессор контента"""
 
+    # Сколько результатов обработки хранить в кэше
+    _CACHE_SIZE = 128
+
     def __init__(self):
         self.analyzers = {
             "table": TableAnalyzer(),
@@ -333,15 +369,63 @@ class ContentProcessor:
             "paragraph": ParagraphAnalyzer(),
         }
 
+        # Результаты обработки по хэшу содержимого и набору анализаторов,
+        # от давно не использованных к недавним (LRU)
+        self._cache: OrderedDict[
+            Tuple[str, Optional[frozenset]],
+            Tuple[str, Dict[str, List[ContentElement]]],
+        ] = OrderedDict()
+
     def process_content(
-        self, content: str
+        self, content: str, needed: Optional[Iterable[str]] = None
     ) -> Tuple[str, Dict[str, List[ContentElement]]]:
-        """Обработка контента"""
+        """Обработка контента
+
+        needed - имена анализаторов, результаты которых нужны вызывающему
+        коду (по умолчанию все). Очистка выполняется полностью в любом случае.
+        Для уже встречавшегося содержимого результат берется из кэша;
+        возвращаются копии элементов, их изменение не затрагивает кэш
+        """
+        if needed is not None:
+            needed = frozenset(needed)
+
+        # surrogatepass: ключ различает и строки с одиночными суррогатами
+        key = (
+            hashlib.blake2b(
+                content.encode("utf-8", "surrogatepass"), digest_size=16
+            ).hexdigest(),
+            needed,
+        )
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._process(content, needed)
+            if len(self._cache) >= self._CACHE_SIZE:
+                # Вытесняем запись, которая дольше всех не использовалась
+                self._cache.popitem(last=False)
+            self._cache[key] = cached
+        else:
+            self._cache.move_to_end(key)
+
+        # Элементы и их метаданные копируются, чтобы вызывающий код не менял кэш
+        cleaned_content, analysis_results = cached
+        return cleaned_content, {
+            name: [
+                ContentElement(e.type, e.level, e.content, dict(e.metadata))
+                for e in elements
+            ]
+            for name, elements in analysis_results.items()
+        }
+
+    def _process(
+        self, content: str, needed: Optional[frozenset]
+    ) -> Tuple[str, Dict[str, List[ContentElement]]]:
+        """Анализ и очистка контента без кэша"""
 
-        # Анализируем контент всеми анализаторами
+        # Анализируем контент нужными анализаторами
         analysis_results = {}
         for name, analyzer in self.analyzers.items():
-            analysis_results[name] = analyzer.analyze(content)
+            if needed is None or name in needed:
+                analysis_results[name] = analyzer.analyze(content)
 
         # Применяем очистку
         cleaned_content = content
@@ -355,38 +439,54 @@ class ContentProcessor:
     ) -> str:
         """Генерация отчета об анализе контента"""
 
-        report = "## Анализ контента\n\n"
+        parts: List[str] = ["## Анализ контента\n\n"]
 
         for analyzer_name, elements in analysis_results.items():
             if elements:
-                report += f"### {analyzer_name.title()}\n"
-                report += f"Найдено элементов: {len(elements)}\n\n"
+                parts.append(
+                    f"### {analyzer_name.title()}\n"
+                    f"Найдено элементов: {len(elements)}\n\n"
+                )
 
                 for i, element in enumerate(elements[:5]):  # Показываем первые 5
-                    report += f"**Элемент {i+1}:**\n"
-                    report += f"- Тип: {element.type}\n"
-                    report += f"- Уровень: {element.level}\n"
-                    report += f"- Содержимое: {element.content[:100]}...\n"
+                    parts.append(
+                        f"**Элемент {i+1}:**\n"
+                        f"- Тип: {element.type}\n"
+                        f"- Уровень: {element.level}\n"
+                        f"- Содержимое: {element.content[:100]}...\n"
+                    )
                     if element.metadata:
-                        report += f"- Метаданные: {element.metadata}\n"
-                    report += "\n"
+                        parts.append(f"- Метаданные: {element.metadata}\n")
+                    parts.append("\n")
 
                 if len(elements) > 5:
-                    report += f"... и еще {len(elements) - 5} элементов\n\n"
+                    parts.append(f"... и еще {len(elements) - 5} элементов\n\n")
 
-        return report
+        return "".join(parts)
 
 
 class SmartContentExtractor:
     """Умный извлекатель контента"""
 
+    _SECTION_NUMBER_RE = re.compile(r"^\d+\.\s*")
+
     def __init__(self):
         self.content_processor = ContentProcessor()
 
     def extract_structured_content(self, content: str) -> Dict[str, str]:
         """Извлечение структурированного контента"""
 
-        cleaned_content, analysis = self.content_processor.process_content(content)
+        # Для разбиения на разделы нужны только заголовки
+        cleaned_content, analysis = self.content_processor.process_content(
+            content, needed={"heading"}
+        )
+        return self.extract_from_analysis(cleaned_content, analysis)
+
+    def extract_from_analysis(
+        self, cleaned_content: str, analysis: Dict[str, List[ContentElement]]
+    ) -> Dict[str, str]:
+        """Извлечение структурированного контента из готового результата
+        ContentProcessor.process_content без повторного прохода по документу"""
 
         # Извлекаем заголовки и их содержимое
         headings = analysis.get("heading", [])
@@ -395,10 +495,19 @@ class SmartContentExtractor:
         if not headings:
             return {"main_content": cleaned_content}
 
+        # Позиции markdown-заголовков очищенного текста - за один проход
+        # (первое вхождение каждого заголовка)
+        title_positions = {}
+        for match in HeadingAnalyzer._HEADING_RE.finditer(cleaned_content):
+            title_positions.setdefault(match.group(2).strip(), match.start(2))
+
         # Сортируем заголовки по позиции в тексте
         heading_positions = []
         for heading in headings:
-            pos = cleaned_content.find(heading.content)
+            pos = title_positions.get(heading.content)
+            if pos is None:
+                # Текст заголовка изменился при очистке - ищем как подстроку
+                pos = cleaned_content.find(heading.content)
             if pos != -1:
                 heading_positions.append((pos, heading))
 
@@ -435,15 +544,21 @@ class SmartContentExtractor:
 
         merged = {}
 
+        # Названия разделов в нижнем регистре - один раз на все целевые разделы
+        lowered_sections = [
+            (section_name.lower(), content)
+            for section_name, content in sections.items()
+        ]
+        exact_matches = {}
+        for section_clean, content in lowered_sections:
+            exact_matches.setdefault(section_clean, content)
+
         for target in target_sections:
-            target_clean = re.sub(r"^\d+\.\s*", "", target).lower()
+            target_clean = self._SECTION_NUMBER_RE.sub("", target).lower()
 
             # Прямое совпадение
-            for section_name, content in sections.items():
-                section_clean = section_name.lower()
-                if target_clean == section_clean:
-                    merged[target] = content
-                    break
+            if target_clean in exact_matches:
+                merged[target] = exact_matches[target_clean]
             else:
                 # Поиск по ключевым словам
                 best_match = None
@@ -451,8 +566,7 @@ class SmartContentExtractor:
 
                 keywords = target_clean.split()
 
-                for section_name, content in sections.items():
-                    section_clean = section_name.lower()
+                for section_clean, content in lowered_sections:
                     score = sum(1 for keyword in keywords if keyword in section_clean)
 
                     if score > best_score:
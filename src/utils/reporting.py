@@ -6,7 +6,7 @@ Handles console and file report generation.
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Union
+from typing import List, Union
 
 from .processor import ProcessingResults
 
@@ -122,21 +122,23 @@ class ProcessingReporter:
         """Generate markdown report content"""
         timestamp_str = self.timestamp.strftime("%Y-%m-%d %H:%M:%S")
 
+        parts: List[str] = []
+
         # Header
         if is_update:
-            content = "# Отчет о постобработке документов (обновлен)\n\n"
+            parts.append("# Отчет о постобработке документов (обновлен)\n\n")
         else:
-            content = "# Отчет о постобработке документов\n\n"
+            parts.append("# Отчет о постобработке документов\n\n")
 
-        content += f"**Дата создания:** {timestamp_str}\n"
-        content += "**Генератор:** DocxMD Converter v0.1.0\n\n"
+        parts.append(f"**Дата создания:** {timestamp_str}\n")
+        parts.append("**Генератор:** DocxMD Converter v0.1.0\n\n")
 
         # Executive Summary
-        content += "## Краткое резюме\n\n"
-        content += f"✅ **Успешно обработано:** {results.processed} документов\n"
-        content += f"⏭️ **Пропущено:** {results.skipped} документов\n"
-        content += f"❌ **Ошибок:** {results.errors}\n"
-        content += f"📁 **Всего файлов:** {results.total}\n\n"
+        parts.append("## Краткое резюме\n\n")
+        parts.append(f"✅ **Успешно обработано:** {results.processed} документов\n")
+        parts.append(f"⏭️ **Пропущено:** {results.skipped} документов\n")
+        parts.append(f"❌ **Ошибок:** {results.errors}\n")
+        parts.append(f"📁 **Всего файлов:** {results.total}\n\n")
 
         # Status
         if results.errors == 0:
@@ -146,18 +148,18 @@ class ProcessingReporter:
         else:
             status = "❌ Выполнение не удалось"
 
-        content += f"**Общий статус:** {status}\n\n"
+        parts.append(f"**Общий статус:** {status}\n\n")
 
         # Success rate
         if results.total > 0:
             success_rate = (results.processed / results.total) * 100
-            content += f"**Процент успеха:** {success_rate:.1f}%\n\n"
+            parts.append(f"**Процент успеха:** {success_rate:.1f}%\n\n")
 
-        content += "---\n\n"
+        parts.append("---\n\n")
 
         # Quality Statistics
         if any(results.quality_stats.values()):
-            content += "## Статистика качества обработки\n\n"
+            parts.append("## Статистика качества обработки\n\n")
             total_processed = sum(results.quality_stats.values())
 
             if total_processed > 0:
@@ -165,107 +167,115 @@ class ProcessingReporter:
                 medium_pct = (results.quality_stats["medium"] / total_processed) * 100
                 low_pct = (results.quality_stats["low"] / total_processed) * 100
 
-                content += "| Качество | Количество файлов | Процент | Описание |\n"
-                content += "|----------|-------------------|---------|----------|\n"
+                parts.append("| Качество | Количество файлов | Процент | Описание |\n")
+                parts.append("|----------|-------------------|---------|----------|\n")
                 high_desc = "Все разделы заполнены структурированным содержимым"
                 medium_desc = "Большинство разделов заполнено"
                 low_desc = "Только структура, минимум содержимого"
 
-                content += f"| **🟢 Высокое** | {results.quality_stats['high']} | {high_pct:.1f}% | {high_desc} |\n"
-                content += f"| **🟡 Среднее** | {results.quality_stats['medium']} | {medium_pct:.1f}% | {medium_desc} |\n"
-                content += f"| **🔴 Низкое** | {results.quality_stats['low']} | {low_pct:.1f}% | {low_desc} |\n\n"
+                parts.append(
+                    f"| **🟢 Высокое** | {results.quality_stats['high']} | {high_pct:.1f}% | {high_desc} |\n"
+                )
+                parts.append(
+                    f"| **🟡 Среднее** | {results.quality_stats['medium']} | {medium_pct:.1f}% | {medium_desc} |\n"
+                )
+                parts.append(
+                    f"| **🔴 Низкое** | {results.quality_stats['low']} | {low_pct:.1f}% | {low_desc} |\n\n"
+                )
 
         # Processing Details
         if results.processed > 0:
-            content += "## Детали обработки\n\n"
-            content += "### ✅ Успешно обработанные файлы\n\n"
+            parts.append("## Детали обработки\n\n")
+            parts.append("### ✅ Успешно обработанные файлы\n\n")
 
             if len(results.files_processed) <= 20:
                 # Show all files if not too many
                 for i, file_path in enumerate(results.files_processed, 1):
-                    content += f"{i}. `{Path(file_path).name}`\n"
+                    parts.append(f"{i}. `{Path(file_path).name}`\n")
             else:
                 # Show first 10 and last 10
                 for i, file_path in enumerate(results.files_processed[:10], 1):
-                    content += f"{i}. `{Path(file_path).name}`\n"
-                content += (
+                    parts.append(f"{i}. `{Path(file_path).name}`\n")
+                parts.append(
                     f"... (пропущено {len(results.files_processed) - 20} файлов) ...\n"
                 )
                 for i, file_path in enumerate(
                     results.files_processed[-10:], len(results.files_processed) - 9
                 ):
-                    content += f"{i}. `{Path(file_path).name}`\n"
+                    parts.append(f"{i}. `{Path(file_path).name}`\n")
 
-            content += "\n"
+            parts.append("\n")
 
         # Skipped files
         if results.files_skipped:
-            content += "### ⏭️ Пропущенные файлы\n\n"
-            content += "Следующие файлы были пропущены (уже обработаны ранее):\n\n"
+            parts.append("### ⏭️ Пропущенные файлы\n\n")
+            parts.append("Следующие файлы были пропущены (уже обработаны ранее):\n\n")
 
             for file_path in results.files_skipped[:10]:  # Show max 10
-                content += f"- `{Path(file_path).name}`\n"
+                parts.append(f"- `{Path(file_path).name}`\n")
 
             if len(results.files_skipped) > 10:
-                content += f"- ... и еще {len(results.files_skipped) - 10} файлов\n"
+                parts.append(f"- ... и еще {len(results.files_skipped) - 10} файлов\n")
 
-            content += "\n"
+            parts.append("\n")
 
         # Errors
         if results.files_errored:
-            content += "### ❌ Ошибки обработки\n\n"
-            content += "Следующие файлы не удалось обработать:\n\n"
+            parts.append("### ❌ Ошибки обработки\n\n")
+            parts.append("Следующие файлы не удалось обработать:\n\n")
 
             for error in results.files_errored[:10]:  # Show max 10
-                content += f"- {error}\n"
+                parts.append(f"- {error}\n")
 
             if len(results.files_errored) > 10:
-                content += f"- ... и еще {len(results.files_errored) - 10} ошибок\n"
+                parts.append(f"- ... и еще {len(results.files_errored) - 10} ошибок\n")
 
-            content += "\n"
+            parts.append("\n")
 
         # Recommendations
-        content += "---\n\n"
-        content += "## Рекомендации\n\n"
+        parts.append("---\n\n")
+        parts.append("## Рекомендации\n\n")
 
         if results.quality_stats["low"] > 0:
             low_count = results.quality_stats["low"]
-            content += f"### 📝 Документы с низким качеством ({low_count} шт.)\n\n"
+            parts.append(f"### 📝 Документы с низким качеством ({low_count} шт.)\n\n")
             recommendation = "Рекомендуется ручная доработка документов с низким качеством обработки:"
-            content += f"{recommendation}\n\n"
-            content += (
+            parts.append(f"{recommendation}\n\n")
+            parts.append(
                 '1. Найдите документы с `"processing_quality": "low"` в метаданных\n'
             )
-            content += "2. Дополните содержимое разделов вручную\n"
-            content += "3. Обновите метаданные после доработки\n\n"
+            parts.append("2. Дополните содержимое разделов вручную\n")
+            parts.append("3. Обновите метаданные после доработки\n\n")
 
         if results.files_errored:
-            content += (
+            parts.append(
                 f"### 🔧 Устранение ошибок ({len(results.files_errored)} шт.)\n\n"
             )
-            content += "Для исправления ошибок:\n\n"
-            content += "1. Проверьте права доступа к файлам\n"
-            content += "2. Убедитесь в корректности кодировки файлов (UTF-8)\n"
-            content += "3. Проверьте структуру исходных документов\n"
-            content += (
+            parts.append("Для исправления ошибок:\n\n")
+            parts.append("1. Проверьте права доступа к файлам\n")
+            parts.append("2. Убедитесь в корректности кодировки файлов (UTF-8)\n")
+            parts.append("3. Проверьте структуру исходных документов\n")
+            parts.append(
                 "4. Попробуйте повторную обработку с флагом `--force-process`\n\n"
             )
 
         # Next steps
-        content += "### 🚀 Дальнейшие действия\n\n"
-        content += (
+        parts.append("### 🚀 Дальнейшие действия\n\n")
+        parts.append(
             "1. **Проверка качества:** Просмотрите документы с низким качеством\n"
         )
-        content += "2. **Ручная доработка:** Дополните содержимое при необходимости\n"
-        content += "3. **Повторная обработка:** Используйте улучшенный алгоритм\n"
-        content += "4. **Интеграция:** Внедрите обработку в процесс CI/CD\n\n"
+        parts.append(
+            "2. **Ручная доработка:** Дополните содержимое при необходимости\n"
+        )
+        parts.append("3. **Повторная обработка:** Используйте улучшенный алгоритм\n")
+        parts.append("4. **Интеграция:** Внедрите обработку в процесс CI/CD\n\n")
 
         # Technical Information
-        content += "---\n\n"
-        content += "## Техническая информация\n\n"
-        content += f"**Время выполнения:** {timestamp_str}\n"
-        content += "**Версия обработчика:** DocxMD Converter v0.1.0\n"
-        content += "**Формат данных:** Markdown с JSON метаданными\n\n"
+        parts.append("---\n\n")
+        parts.append("## Техническая информация\n\n")
+        parts.append(f"**Время выполнения:** {timestamp_str}\n")
+        parts.append("**Версия обработчика:** DocxMD Converter v0.1.0\n")
+        parts.append("**Формат данных:** Markdown с JSON метаданными\n\n")
 
         # Metadata
         metadata = {
@@ -276,11 +286,11 @@ class ProcessingReporter:
             "statistics": results.to_dict(),
         }
 
-        content += "<!-- REPORT METADATA\n"
-        content += json.dumps(metadata, indent=2, ensure_ascii=False)
-        content += "\n-->\n"
+        parts.append("<!-- REPORT METADATA\n")
+        parts.append(json.dumps(metadata, indent=2, ensure_ascii=False))
+        parts.append("\n-->\n")
 
-        return content
+        return "".join(parts)
 
     def generate_summary_report(self, results: ProcessingResults) -> str:
         """Generate brief summary report"""
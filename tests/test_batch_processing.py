@@ -0,0 +1,62 @@
+"""
+Tests for the batch NLP and quality assessment APIs.
+"""
+
+import pytest
+
+from docxmd_converter.nlp_analyzer import NLPAnalyzer
+from docxmd_converter.pool_utils import BATCH_POOL_THRESHOLD, pool_size
+from docxmd_converter.quality_assessor import IntelligentQualityAssessor
+
+
+def make_texts(count):
+    """Distinct short markdown documents."""
+    return [
+        f"# Отчет {i}\n\n## 1. Результаты\n\n"
+        f"Анализ показал рост на {i * 3}% за 2023 год. Иванов И.И. {'ИТОГ ' * (i % 3)}\n\n"
+        f"- пункт {i}\n- пункт {i + 1}\n"
+        for i in range(count)
+    ]
+
+
+class TestBatchProcessing:
+    """Batch results must match per-item calls, in the same order."""
+
+    @pytest.mark.parametrize(
+        "count, max_workers",
+        [(3, None), (BATCH_POOL_THRESHOLD, 2)],
+        ids=["inline", "pool"],
+    )
+    def test_extract_features_batch(self, count, max_workers):
+        """Test batch feature extraction against extract_features."""
+        analyzer = NLPAnalyzer()
+        texts = make_texts(count)
+
+        batch = analyzer.extract_features_batch(texts, max_workers=max_workers)
+
+        assert batch == [analyzer.extract_features(text) for text in texts]
+
+    @pytest.mark.parametrize(
+        "count, max_workers",
+        [(3, None), (BATCH_POOL_THRESHOLD, 2)],
+        ids=["inline", "pool"],
+    )
+    def test_assess_quality_batch(self, count, max_workers):
+        """Test batch quality assessment against assess_quality."""
+        analyzer = NLPAnalyzer()
+        assessor = IntelligentQualityAssessor()
+        items = [
+            (text, analyzer.extract_features(text), "отчет", {"index": i})
+            for i, text in enumerate(make_texts(count))
+        ]
+
+        batch = assessor.assess_quality_batch(items, max_workers=max_workers)
+
+        assert batch == [assessor.assess_quality(*item) for item in items]
+
+    def test_pool_size(self):
+        """Test that small batches and a single worker run inline."""
+        assert pool_size(BATCH_POOL_THRESHOLD - 1, max_workers=8) == 1
+        assert pool_size(BATCH_POOL_THRESHOLD, max_workers=1) == 1
+        assert pool_size(BATCH_POOL_THRESHOLD, max_workers=4) == 4
+        assert pool_size(BATCH_POOL_THRESHOLD, max_workers=64) == BATCH_POOL_THRESHOLD
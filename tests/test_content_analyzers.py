@@ -0,0 +1,74 @@
+"""
+Tests for the content processor cache.
+"""
+
+import sys
+from pathlib import Path
+
+# The utils package is not installed with docxmd_converter
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.content_analyzers import ContentProcessor  # noqa: E402
+
+DOCUMENT = "# Title\n\n## 1. Section\n\nSome text here.\n\n- first\n- second\n"
+
+
+class TestContentProcessorCache:
+    """Test cases for ContentProcessor result caching."""
+
+    def test_cache_hit(self):
+        """Test that repeated content is served from the cache."""
+        processor = ContentProcessor()
+        first = processor.process_content(DOCUMENT)
+
+        processor._process = None  # any further analysis would fail
+        second = processor.process_content(DOCUMENT)
+
+        assert second == first
+        assert len(processor._cache) == 1
+
+    def test_lru_eviction(self):
+        """Test that a recently used entry survives eviction."""
+        processor = ContentProcessor()
+        processor._CACHE_SIZE = 2
+
+        processor.process_content("# A\n")
+        processor.process_content("# B\n")
+        processor.process_content("# A\n")  # A becomes the most recent
+        processor.process_content("# C\n")  # evicts B
+
+        calls = []
+        original = processor._process
+        processor._process = lambda *args: calls.append(args) or original(*args)
+
+        processor.process_content("# A\n")
+        assert calls == []
+
+        processor.process_content("# B\n")
+        assert len(calls) == 1
+        assert len(processor._cache) == 2
+
+    def test_cached_results_isolated(self):
+        """Test that mutating returned elements does not change the cache."""
+        processor = ContentProcessor()
+        _, results = processor.process_content(DOCUMENT)
+        heading = results["heading"][0]
+        expected_content = heading.content
+        expected_metadata = dict(heading.metadata)
+
+        heading.content = "changed"
+        heading.metadata["changed"] = "yes"
+        results["heading"].clear()
+
+        _, again = processor.process_content(DOCUMENT)
+        assert again["heading"][0].content == expected_content
+        assert again["heading"][0].metadata == expected_metadata
+
+    def test_cache_key_keeps_surrogates(self):
+        """Test that inputs differing only in a lone surrogate do not share a key."""
+        processor = ContentProcessor()
+        with_surrogate, _ = processor.process_content("# Title\ud800\n")
+        plain, _ = processor.process_content("# Title\n")
+
+        assert len(processor._cache) == 2
+        assert with_surrogate != plain
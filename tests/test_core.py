@@ -2,22 +2,32 @@
 Tests for core conversion functionality.
 """
 
-import shutil
-import tempfile
-from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from docxmd_converter.core import ConversionError, DocxMdConverter
+from docxmd_converter.core import ConversionError, DocxMdConverter, _pandoc_version
+
+
+@pytest.fixture(scope="module")
+def converter():
+    """Converter shared by the tests that do not check initialization."""
+    _pandoc_version.cache_clear()
+    with patch("docxmd_converter.core.pypandoc.get_pandoc_version") as mock_version:
+        mock_version.return_value = "2.19"
+        return DocxMdConverter()
 
 
 class TestDocxMdConverter:
     """Test cases for DocxMdConverter class."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        self.temp_dir = Path(tempfile.mkdtemp())
+    @pytest.fixture(autouse=True)
+    def setup_dirs(self, tmp_path):
+        """Setup test environment (pytest removes tmp_path itself)."""
+        # Every test mocks pandoc on its own
+        _pandoc_version.cache_clear()
+
+        self.temp_dir = tmp_path
 
         # Create test directories
         self.src_dir = self.temp_dir / "src"
@@ -25,11 +35,6 @@ class TestDocxMdConverter:
         self.src_dir.mkdir()
         self.dst_dir.mkdir()
 
-    def teardown_method(self):
-        """Cleanup test environment."""
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
-
     @patch("docxmd_converter.core.pypandoc.get_pandoc_version")
     def test_init_success(self, mock_version):
         """Test successful initialization."""
@@ -45,11 +50,9 @@ class TestDocxMdConverter:
         with pytest.raises(ConversionError, match="Pandoc is not installed"):
             DocxMdConverter()
 
-    @patch("docxmd_converter.core.pypandoc.get_pandoc_version")
     @patch("docxmd_converter.core.pypandoc.convert_file")
-    def test_convert_docx_to_md(self, mock_convert, mock_version):
+    def test_convert_docx_to_md(self, mock_convert, converter):
         """Test .docx to .md conversion."""
-        mock_version.return_value = "2.19"
         mock_convert.return_value = None
 
         # Create test files
@@ -57,42 +60,29 @@ class TestDocxMdConverter:
         output_file = self.dst_dir / "test.md"
         input_file.touch()  # Create empty file
 
-        converter = DocxMdConverter()
         result = converter.convert_file(input_file, output_file, "docx2md")
 
         assert result is True
         mock_convert.assert_called_once()
 
-    @patch("docxmd_converter.core.pypandoc.get_pandoc_version")
-    def test_convert_file_not_exists(self, mock_version):
+    def test_convert_file_not_exists(self, converter):
         """Test conversion with non-existent input file."""
-        mock_version.return_value = "2.19"
-
-        converter = DocxMdConverter()
         result = converter.convert_file("nonexistent.docx", "output.md", "docx2md")
 
         assert result is False
 
-    @patch("docxmd_converter.core.pypandoc.get_pandoc_version")
-    def test_invalid_direction(self, mock_version):
+    def test_invalid_direction(self, converter):
         """Test conversion with invalid direction."""
-        mock_version.return_value = "2.19"
-
         input_file = self.src_dir / "test.docx"
         output_file = self.dst_dir / "test.md"
         input_file.touch()
 
-        converter = DocxMdConverter()
         result = converter.convert_file(input_file, output_file, "invalid")
 
         assert result is False
 
-    @patch("docxmd_converter.core.pypandoc.get_pandoc_version")
-    def test_convert_directory_no_files(self, mock_version):
+    def test_convert_directory_no_files(self, converter):
         """Test directory conversion with no matching files."""
-        mock_version.return_value = "2.19"
-
-        converter = DocxMdConverter()
         successful, total = converter.convert_directory(
             self.src_dir, self.dst_dir, "docx2md"
         )
@@ -100,11 +90,9 @@ class TestDocxMdConverter:
         assert successful == 0
         assert total == 0
 
-    @patch("docxmd_converter.core.pypandoc.get_pandoc_version")
     @patch("docxmd_converter.core.pypandoc.convert_file")
-    def test_convert_directory_with_files(self, mock_convert, mock_version):
+    def test_convert_directory_with_files(self, mock_convert, converter):
         """Test directory conversion with files."""
-        mock_version.return_value = "2.19"
         mock_convert.return_value = None
 
         # Create test files in subdirectories
@@ -112,7 +100,6 @@ class TestDocxMdConverter:
         (self.src_dir / "file1.docx").touch()
         (self.src_dir / "subdir" / "file2.docx").touch()
 
-        converter = DocxMdConverter()
         successful, total = converter.convert_directory(
             self.src_dir, self.dst_dir, "docx2md"
         )
@@ -121,48 +108,50 @@ class TestDocxMdConverter:
         assert total == 2
         assert mock_convert.call_count == 2
 
-    @patch("docxmd_converter.core.pypandoc.get_pandoc_version")
-    def test_validate_template_valid(self, mock_version):
-        """Test template validation with valid template."""
-        mock_version.return_value = "2.19"
+    @patch("docxmd_converter.core.pypandoc.convert_file")
+    def test_convert_directory_parallel(self, mock_convert, converter):
+        """Test directory conversion with several worker threads."""
+        mock_convert.return_value = None
+
+        for i in range(5):
+            (self.src_dir / f"file{i}.docx").touch()
+
+        successful, total = converter.convert_directory(
+            self.src_dir, self.dst_dir, "docx2md", max_workers=3
+        )
+
+        assert successful == 5
+        assert total == 5
+        assert mock_convert.call_count == 5
+        outputs = {call.kwargs["outputfile"] for call in mock_convert.call_args_list}
+        assert outputs == {str(self.dst_dir / f"file{i}.md") for i in range(5)}
 
+    def test_validate_template_valid(self, converter):
+        """Test template validation with valid template."""
         template_file = self.temp_dir / "template.docx"
         template_file.touch()
 
-        converter = DocxMdConverter()
         result = converter.validate_template(template_file)
 
         assert result is True
 
-    @patch("docxmd_converter.core.pypandoc.get_pandoc_version")
-    def test_validate_template_not_exists(self, mock_version):
+    def test_validate_template_not_exists(self, converter):
         """Test template validation with non-existent file."""
-        mock_version.return_value = "2.19"
-
-        converter = DocxMdConverter()
         result = converter.validate_template("nonexistent.docx")
 
         assert result is False
 
-    @patch("docxmd_converter.core.pypandoc.get_pandoc_version")
-    def test_validate_template_wrong_extension(self, mock_version):
+    def test_validate_template_wrong_extension(self, converter):
         """Test template validation with wrong file extension."""
-        mock_version.return_value = "2.19"
-
         template_file = self.temp_dir / "template.txt"
         template_file.touch()
 
-        converter = DocxMdConverter()
         result = converter.validate_template(template_file)
 
         assert result is False
 
-    @patch("docxmd_converter.core.pypandoc.get_pandoc_version")
-    def test_get_supported_directions(self, mock_version):
+    def test_get_supported_directions(self, converter):
         """Test getting supported conversion directions."""
-        mock_version.return_value = "2.19"
-
-        converter = DocxMdConverter()
         directions = converter.get_supported_directions()
 
         assert "docx2md" in directions